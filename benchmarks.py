@@ -0,0 +1,293 @@
+"""Offline microbenchmarks with committed regression budgets.
+
+Times metro data loading (cold from the store and warm from the shared
+cache), every hint figure builder for every metro, the score distribution
+and HUD score bar builders, guess processing, metro search and one race
+event fanned out to a full room. Figure
+benchmarks also record the serialized JSON size. Results are compared with
+``benchmarks_baseline.json``; a benchmark fails when its time grows by more
+than ``--threshold`` or its figure size by more than ``--size-threshold``.
+
+Times are compared as a ratio to a fixed pure-Python calibration workload
+timed just before each benchmark (both on their fastest round), so a slower
+or busier machine than the one that recorded the baseline does not read as
+a regression. ``--update`` records each benchmark's median of several
+passes, and a benchmark over budget is re-measured before it is reported::
+
+    python benchmarks.py                  # compare with the baseline, exit 1 on regression
+    python benchmarks.py --filter hint:   # only benchmarks whose name contains "hint:"
+    python benchmarks.py --update         # record a new baseline
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import plotly.graph_objects as go
+
+import game_engine
+import hint_figures
+import metro_search
+import race_hub
+import score_distribution
+from game_config import METRO_IDS, METROS
+
+BASE_DIR = Path(__file__).resolve().parent
+BASELINE_FILE = BASE_DIR / "benchmarks_baseline.json"
+BASELINE_VERSION = 1
+
+# Allowed growth over the baseline before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_SIZE_THRESHOLD = 0.05
+# Time differences below this are noise, whatever the ratio
+NOISE_FLOOR_MS = 0.05
+# Each benchmark runs REPEATS rounds of as many calls as fit in ROUND_SECONDS
+REPEATS = 15
+ROUND_SECONDS = 0.03
+# Extra measurements of an apparent regression before it is reported
+CONFIRM_ATTEMPTS = 3
+UPDATE_PASSES = 3
+
+
+def figure_bytes(figures) -> int:
+    """Serialized Plotly JSON size of a figure or list of figures."""
+    if isinstance(figures, go.Figure):
+        figures = [figures]
+    return sum(len(fig.to_json().encode("utf-8")) for fig in figures)
+
+
+def measure(func, repeats: int = REPEATS, round_seconds: float = ROUND_SECONDS) -> dict:
+    """Median and minimum milliseconds per call of func(), timeit-style."""
+    started = time.perf_counter()
+    result = func()
+    single = time.perf_counter() - started
+    loops = max(1, int(round_seconds / single)) if single > 0 else 1000
+    per_call = []
+    # As timeit does, keep collector pauses out of the timings
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            per_call.append((time.perf_counter() - started) / loops * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {'median_ms': statistics.median(per_call), 'min_ms': min(per_call), 'loops': loops, 'result': result}
+
+
+def calibration_workload() -> int:
+    """Fixed pure-Python work used to normalize timings across machines."""
+    total = 0
+    for i in range(20_000):
+        total += len(str(i * 7919)) + hash((i, "metro")) % 7
+    return total
+
+
+def play_scripted_game(metro_key: str = 'Memphis') -> game_engine.GameState:
+    """Four wrong guesses with hint reveals, then the right answer."""
+    answer = METRO_IDS[METROS[metro_key]['name']]
+    wrong = [metro_id for metro_id in METRO_IDS.values() if metro_id != answer][:4]
+    state = game_engine.new_game(metro_key, answer)
+    for metro_id in wrong:
+        state = game_engine.reduce(state, game_engine.Guess(metro_id))
+        state = game_engine.reduce(state, game_engine.REVEAL_HINT)
+    return game_engine.reduce(state, game_engine.Guess(answer))
+
+
+def _search_keystrokes(index: metro_search.MetroIndex, text: str) -> None:
+    index._matches.clear()
+    for end in range(1, len(text) + 1):
+        index.search(text[:end])
+
+
+def race_event(players: int = race_hub.MAX_PLAYERS):
+    """Return a callable that publishes one guess to a full room and lets every other player render it."""
+    hub = race_hub.RaceHub(max_players=players)
+    code = hub.create_room('Memphis')
+    player_ids = [hub.join(code, "", lambda: True) for _ in range(players)]
+    state = play_scripted_game()
+
+    def event() -> None:
+        hub.publish(code, player_ids[0], state)
+        for player_id in player_ids[1:]:
+            hub.standings(code, player_id)
+
+    return event
+
+
+def benchmarks() -> dict:
+    """Return {name: (callable, is_figure)} for every benchmark, in run order."""
+    cases = {}
+    for metro_key in METROS:
+        cases[f"load_metro_data:cold:{metro_key}"] = (
+            lambda metro_key=metro_key: hint_figures.load_metro_data(metro_key), False)
+        cases[f"load_metro_data:warm:{metro_key}"] = (
+            lambda metro_key=metro_key: hint_figures.get_metro_data(metro_key), False)
+    for metro_key in METROS:
+        for hint_key in hint_figures.HINT_FIGURE_BUILDERS:
+            cases[f"hint:{hint_key}:{metro_key}"] = (
+                lambda metro_key=metro_key, hint_key=hint_key: hint_figures.build_hint(metro_key, hint_key), True)
+    for metro_key in METROS:
+        cases[f"score_distribution:mock:{metro_key}"] = (
+            lambda metro_key=metro_key: score_distribution.mock_histogram(metro_key), False)
+        histogram = score_distribution.mock_histogram(metro_key)
+        cases[f"score_distribution:figure:{metro_key}"] = (
+            lambda histogram=histogram: score_distribution.build_distribution_figure(histogram, 3), True)
+    cases["score_bar"] = (lambda: hint_figures.build_score_bar(30, game_engine.MAX_SCORE), True)
+    cases["guess_processing"] = (play_scripted_game, False)
+    index = metro_search.MetroIndex()
+    cases["metro_search:keystrokes"] = (lambda: _search_keystrokes(index, "salt lake city"), False)
+    cases[f"race:fan_out:{race_hub.MAX_PLAYERS}"] = (race_event(), False)
+    return cases
+
+
+def calibrate() -> float:
+    """Fastest-round milliseconds of the calibration workload."""
+    return measure(calibration_workload, repeats=5, round_seconds=0.01)['min_ms']
+
+
+def run_one(func, is_figure: bool) -> dict:
+    """Measure one benchmark against a fresh calibration."""
+    calibration_ms = calibrate()
+    timing = measure(func)
+    entry = {
+        'median_ms': round(timing['median_ms'], 4),
+        'min_ms': round(timing['min_ms'], 4),
+        'relative': round(timing['min_ms'] / calibration_ms, 5),
+    }
+    if is_figure:
+        entry['bytes'] = figure_bytes(timing['result'])
+    return entry
+
+
+def best(entry: dict, other: dict) -> dict:
+    """The faster of two measurements of the same benchmark."""
+    return other if other['relative'] < entry['relative'] else entry
+
+
+def run(name_filter: str = "", passes: int = 1) -> dict:
+    """Run the benchmarks (optionally filtered by substring); return each one's median pass."""
+    hint_figures.register_plotly_template()
+    cases = {name: case for name, case in benchmarks().items() if name_filter in name}
+    runs = {name: [] for name in cases}
+    for _ in range(passes):
+        for name, (func, is_figure) in cases.items():
+            runs[name].append(run_one(func, is_figure))
+    return {
+        name: sorted(entries, key=lambda entry: entry['relative'])[len(entries) // 2]
+        for name, entries in runs.items()
+    }
+
+
+def confirm(results: dict, baseline: dict, threshold: float) -> dict:
+    """Re-measure benchmarks that look regressed, keeping their best result."""
+    cases = benchmarks()
+    for name, entry in results.items():
+        base = baseline.get(name)
+        for _ in range(CONFIRM_ATTEMPTS):
+            if base is None or entry['relative'] <= base['relative'] * (1 + threshold):
+                break
+            entry = best(entry, run_one(*cases[name]))
+        results[name] = entry
+    return results
+
+
+def expected_ms(entry: dict, base: dict) -> float:
+    """Baseline time rescaled to this run's machine speed."""
+    return base['relative'] * entry['min_ms'] / entry['relative']
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            size_threshold: float = DEFAULT_SIZE_THRESHOLD) -> list[str]:
+    """Return a message for every benchmark that regressed past its budget."""
+    regressions = []
+    for name, entry in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        expected = expected_ms(entry, base)
+        if entry['relative'] > base['relative'] * (1 + threshold) and entry['min_ms'] - expected > NOISE_FLOOR_MS:
+            regressions.append(
+                f"{name}: {entry['min_ms']:.3f} ms vs {expected:.3f} ms expected from the baseline "
+                f"(+{entry['relative'] / base['relative'] - 1:.0%}, budget +{threshold:.0%})"
+            )
+        if 'bytes' in entry and 'bytes' in base and entry['bytes'] > base['bytes'] * (1 + size_threshold):
+            regressions.append(
+                f"{name}: {entry['bytes']:,} bytes vs baseline {base['bytes']:,} "
+                f"(+{entry['bytes'] / base['bytes'] - 1:.0%}, budget +{size_threshold:.0%})"
+            )
+    return regressions
+
+
+def read_baseline(path: Path = BASELINE_FILE) -> dict:
+    """Return the committed baseline ({} if missing or from another format version)."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if data.get('version') != BASELINE_VERSION:
+        return {}
+    return data
+
+
+def write_baseline(results: dict, path: Path = BASELINE_FILE) -> None:
+    payload = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': results,
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def format_results(results: dict, baseline: dict) -> str:
+    lines = [f"{'benchmark':<40}{'median ms':>11}{'min ms':>10}{'expected':>10}{'change':>9}{'bytes':>10}"]
+    for name, entry in results.items():
+        base = baseline.get(name)
+        expected = expected_ms(entry, base) if base else None
+        change = f"{entry['relative'] / base['relative'] - 1:+.0%}" if base else ""
+        expected_text = f"{expected:.3f}" if expected is not None else "-"
+        size = f"{entry['bytes']:,}" if 'bytes' in entry else ""
+        lines.append(f"{name:<40}{entry['median_ms']:>11.3f}{entry['min_ms']:>10.3f}"
+                     f"{expected_text:>10}{change:>9}{size:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run microbenchmarks against the committed baseline")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed growth of the fastest-round time relative to the calibration "
+                             "workload, as a fraction (default 0.5 = +50%%)")
+    parser.add_argument("--size-threshold", type=float, default=DEFAULT_SIZE_THRESHOLD,
+                        help="allowed figure size growth as a fraction (default 0.05)")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    baseline = read_baseline().get('benchmarks', {})
+    results = run(args.filter, UPDATE_PASSES if args.update else 1)
+    if not args.update:
+        results = confirm(results, baseline, args.threshold)
+    print(json.dumps(results, indent=2) if args.json else format_results(results, baseline))
+    if args.update:
+        # A filtered run only replaces its own entries
+        write_baseline({**baseline, **results} if args.filter else results)
+        print(f"Wrote {len(results)} results to {BASELINE_FILE.name}")
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.size_threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Small process-wide caches shared by every Streamlit session."""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def deep_sizeof(value) -> int:
+    """Approximate resident bytes of a value (frames, arrays, figures, containers, slotted objects)."""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage) and hasattr(value, 'columns'):
+        return int(memory_usage(index=True, deep=True).sum())
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(deep_sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(deep_sizeof(k) + deep_sizeof(v) for k, v in value.items())
+    if callable(getattr(value, 'to_plotly_json', None)):
+        return sys.getsizeof(value) + deep_sizeof(value.to_plotly_json())
+    slots = getattr(type(value), '__slots__', None)
+    if slots and not isinstance(value, type):
+        missing = object()
+        return sys.getsizeof(value) + sum(
+            deep_sizeof(item) for name in slots if name != '__weakref__'
+            for item in (getattr(value, name, missing),) if item is not missing
+        )
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with hit/miss/eviction counters.
+
+    Bounded by entry count, by approximate resident bytes (``max_bytes``,
+    measured with ``sizeof``) or both; entries older than ``ttl`` seconds
+    are treated as misses.
+    """
+
+    def __init__(self, max_entries: int | None = 128, max_bytes: int | None = None,
+                 ttl: float | None = None, sizeof=deep_sizeof):
+        self.max_entries = max(int(max_entries), 1) if max_entries else None
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.ttl = float(ttl) if ttl else None
+        self._sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it most recently used."""
+        with self._lock:
+            try:
+                value, size, stored_at = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.resident_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        size = self._sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.resident_bytes -= previous[1]
+            self._entries[key] = (value, size, time.monotonic())
+            self.resident_bytes += size
+            # Never evict the entry just stored, even if it alone exceeds the budget
+            while len(self._entries) > 1 and (
+                    (self.max_entries is not None and len(self._entries) > self.max_entries)
+                    or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.resident_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_build(self, key, build):
+        """Return the cached value for key, calling build() to fill a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            # Build outside the lock so a slow build never blocks other sessions
+            value = build()
+            self.put(key, value)
+        return value
+
+    def entry_sizes(self) -> list[tuple]:
+        """Return (key, approximate bytes) for every entry, largest first."""
+        with self._lock:
+            entries = [(key, value, size) for key, (value, size, _) in self._entries.items()]
+        # Sizes are only tracked under a byte budget; walk the others now
+        sizes = [(key, size if self.max_bytes else self._sizeof(value)) for key, value, size in entries]
+        return sorted(sizes, key=lambda item: item[1], reverse=True)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.resident_bytes = 0
+
+    def stats(self) -> dict:
+        """Return counters and current size for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'resident_bytes': self.resident_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,191 @@
+"""Daily puzzle: one metro per UTC day, shared by every player.
+
+The date maps to a metro deterministically: days are grouped into cycles of
+``len(METROS)`` and each cycle plays every metro once in a seeded shuffle,
+so the same day always gives the same metro on every replica and no metro
+comes up twice in a row. A background scheduler keeps the current day's
+``PuzzleBundle`` (compiled records, every hint figure, the sector legend and
+the day's opening score histogram with its charts) built, and builds the
+next day's ``GTM_PUZZLE_LEAD_SECONDS`` before the UTC rollover, so the first
+player of a new day finds it already warm::
+
+    python daily_puzzle.py --days 7
+"""
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import hint_figures
+from game_config import METROS
+
+MODE_ENV = "GTM_PUZZLE_MODE"
+SALT_ENV = "GTM_PUZZLE_SALT"
+LEAD_ENV = "GTM_PUZZLE_LEAD_SECONDS"
+# Longest the scheduler sleeps before re-checking the clock
+MAX_SLEEP_SECONDS = 300
+
+logger = logging.getLogger(__name__)
+
+
+def daily_mode() -> bool:
+    """Whether new sessions start on the daily puzzle (GTM_PUZZLE_MODE=daily)."""
+    return os.environ.get(MODE_ENV, "random").lower() == "daily"
+
+
+def puzzle_day(now: datetime | None = None) -> date:
+    """Return the current puzzle day (UTC, matching the score store's day key)."""
+    return (now or datetime.now(timezone.utc)).date()
+
+
+def seconds_until_rollover(now: datetime | None = None) -> float:
+    """Seconds until the next UTC midnight."""
+    now = now or datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+    return (midnight - now).total_seconds()
+
+
+def _shuffled(keys: list[str], salt: str, cycle: int) -> list[str]:
+    order = sorted(keys)
+    random.Random(f"{salt}:{cycle}").shuffle(order)
+    return order
+
+
+def puzzle_metro(day: date, metros=None, salt: str | None = None) -> str:
+    """Return the metro for a day; stable across processes and restarts."""
+    keys = list(METROS if metros is None else metros)
+    salt = os.environ.get(SALT_ENV, "") if salt is None else salt
+    cycle, position = divmod(day.toordinal(), len(keys))
+    order = _shuffled(keys, salt, cycle)
+    # Don't repeat the previous cycle's last metro on the first day of this one
+    if len(order) > 2 and order[0] == _shuffled(keys, salt, cycle - 1)[-1]:
+        order[0], order[1] = order[1], order[0]
+    return order[position]
+
+
+class PuzzleBundle:
+    """Everything a player needs for one day's puzzle, built once and shared."""
+
+    __slots__ = ('day', 'metro_key', 'records', 'figures', 'legend_html', 'histogram',
+                 'distribution_figures', 'build_seconds')
+
+    def __init__(self, day: date, metro_key: str):
+        import score_distribution  # imported lazily: random-mode servers never build bundles
+
+        started = time.perf_counter()
+        self.day = day
+        self.metro_key = metro_key
+        self.records = hint_figures.get_metro_data(metro_key)
+        self.figures = {
+            hint_key: hint_figures.get_hint_figures(metro_key, hint_key)
+            for hint_key in hint_figures.HINT_FIGURE_BUILDERS
+        }
+        self.legend_html = hint_figures.get_sector_legend_html(metro_key)
+        self.histogram = score_distribution.load_histogram(metro_key, day.isoformat())
+        self.distribution_figures = score_distribution.prime_distribution_figures(metro_key, self.histogram)
+        self.build_seconds = time.perf_counter() - started
+
+
+class PuzzleScheduler:
+    """Keeps today's bundle built and precomputes tomorrow's before the rollover."""
+
+    def __init__(self, lead_seconds: float | None = None):
+        if lead_seconds is None:
+            lead_seconds = float(os.environ.get(LEAD_ENV, 3600))
+        self.lead_seconds = lead_seconds
+        self._bundles = {}  # day -> PuzzleBundle
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "PuzzleScheduler":
+        """Start the scheduler in a daemon thread and return immediately."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="daily-puzzle", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the scheduler after its current step."""
+        self._stop.set()
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Daily puzzle precompute failed")
+            remaining = seconds_until_rollover()
+            # Wake at the precompute point, then again just after midnight
+            until_precompute = remaining - self.lead_seconds
+            wake = until_precompute if until_precompute > 0 else remaining + 1
+            self._stop.wait(min(wake, MAX_SLEEP_SECONDS))
+
+    def tick(self, now: datetime | None = None) -> None:
+        """Build any bundle that should exist now and drop past days."""
+        today = puzzle_day(now)
+        wanted = [today]
+        if seconds_until_rollover(now) <= self.lead_seconds:
+            wanted.append(today + timedelta(days=1))
+        for day in wanted:
+            self.bundle(day)
+        with self._lock:
+            for day in [day for day in self._bundles if day < today]:
+                del self._bundles[day]
+
+    def bundle(self, day: date | None = None) -> PuzzleBundle:
+        """Return a day's bundle, building it now if the scheduler has not yet."""
+        day = day or puzzle_day()
+        bundle = self._bundles.get(day)
+        if bundle is None:
+            with self._lock:
+                bundle = self._bundles.get(day)
+                if bundle is None:
+                    bundle = self._bundles[day] = PuzzleBundle(day, puzzle_metro(day))
+                    logger.info("Built puzzle bundle for %s (%s) in %.2fs",
+                                day, bundle.metro_key, bundle.build_seconds)
+        return bundle
+
+    def held_bundle(self, day: date) -> PuzzleBundle | None:
+        """Return a day's bundle only if it is already built."""
+        return self._bundles.get(day)
+
+    def stats(self) -> dict:
+        """Return {day: metro and build time} for the held bundles."""
+        return {
+            day.isoformat(): {'metro': bundle.metro_key, 'build_seconds': bundle.build_seconds}
+            for day, bundle in sorted(self._bundles.items())
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PuzzleScheduler:
+    """Return the process-wide scheduler, starting it on first use."""
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PuzzleScheduler().start()
+    return _scheduler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the upcoming daily puzzle schedule")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--build", action="store_true", help="also build today's bundle and time it")
+    args = parser.parse_args()
+    today = puzzle_day()
+    for offset in range(args.days):
+        day = today + timedelta(days=offset)
+        print(f"{day.isoformat()}  {puzzle_metro(day)}")
+    if args.build:
+        hint_figures.register_plotly_template()
+        bundle = PuzzleScheduler().bundle(today)
+        print(f"Built {bundle.metro_key} bundle in {bundle.build_seconds:.2f}s")
@@ -0,0 +1,490 @@
+"""Incremental, validated compile of ``game_data/`` into the Arrow store.
+
+Each metro's tables live in ``game_data/<metro>/<table>.csv``. A compile
+hashes every metro directory (recorded in the store index) and re-reads only
+the metros whose hash changed since the last compile. Their CSVs are parsed
+with the store's column types and checked with vectorized Arrow compute:
+schema, empty cells, value ranges and consistency (``sector_pct`` against
+sector headcounts, ``subsector_pct`` adding up to 100 in each sector, salary
+ranges, year-over-year totals). A rebuild of many metros parses them in
+parallel worker processes.
+
+Each store table is then laid out again from the changed metros' rows and
+zero-copy slices of the unchanged ones, and compared with the combined
+``all_metros_<table>.csv`` copy, which must hold exactly the same rows.
+Nothing is written if any check fails::
+
+    python data_compiler.py             # compile the metros that changed
+    python data_compiler.py --force     # recompile every metro
+    python data_compiler.py --check     # validate everything, write nothing
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+import metro_store
+from metro_store import DATA_DIR, STORE_DIR, TABLE_SCHEMAS
+
+# Changed metros are parsed in worker processes once there are this many
+PARALLEL_MIN_METROS = 16
+MAX_REPORTED = 5
+
+# Tolerances for derived columns that the CSVs store rounded
+SECTOR_PCT_TOLERANCE = 1.0       # points of the metro's total headcount
+SUBSECTOR_PCT_TOLERANCE = 0.05   # points of the sector's headcount
+GROWTH_RATE_TOLERANCE = 0.01
+EDUCATION_PCT_TOLERANCE = 0.1
+
+EMPLOYER_EDUCATION_TYPES = {'noncollege_employers': 'noncollege', 'college_employers': 'college'}
+# Per-sector tables that must cover exactly the sectors in industry.csv
+SECTOR_TABLES = ('salary', 'education', 'growth')
+
+
+class DataValidationError(ValueError):
+    """Raised when source tables fail validation; ``problems`` lists each failure."""
+
+    def __init__(self, problems: list[str]):
+        self.problems = problems
+        super().__init__(f"{len(problems)} data problem(s):\n" + "\n".join(problems))
+
+
+class LoadedMetro(NamedTuple):
+    directory: str
+    metro_key: str | None
+    tables: dict          # table name -> pa.Table with plain text columns
+    problems: list[str]
+
+
+class CompileResult(NamedTuple):
+    index: dict
+    compiled: list[str]   # metro directories re-read this run
+    metros: int
+    seconds: float
+
+
+# ========== SOURCES ==========
+def metro_dirs(data_dir: Path = DATA_DIR) -> dict[str, Path]:
+    """Return {directory name: path} for every metro directory holding table CSVs."""
+    return {
+        path.name: path for path in sorted(data_dir.iterdir())
+        if path.is_dir() and any((path / f"{table_name}.csv").exists() for table_name in TABLE_SCHEMAS)
+    }
+
+
+@lru_cache(maxsize=1)
+def compiler_hash() -> str:
+    """Hash of the validation rules and table schemas; a change recompiles every metro."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(repr(TABLE_SCHEMAS).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def metro_hash(metro_dir: Path) -> str:
+    """Content hash of one metro directory's tables (and the compiler)."""
+    digest = hashlib.sha256(compiler_hash().encode("utf-8"))
+    for table_name in TABLE_SCHEMAS:
+        path = metro_dir / f"{table_name}.csv"
+        digest.update(table_name.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() if path.exists() else b"\0missing\0")
+    return digest.hexdigest()
+
+
+def read_table(path: Path, table_name: str) -> pa.Table:
+    """Parse a table CSV with the store's column types (text columns as plain strings)."""
+    return pa_csv.read_csv(
+        path,
+        convert_options=pa_csv.ConvertOptions(column_types=metro_store.plain_types(table_name)),
+    )
+
+
+# ========== VALIDATION ==========
+def _lines(mask, offset: int = 0) -> str:
+    """CSV line numbers where mask is true (line 1 is the header)."""
+    rows = pc.indices_nonzero(pc.fill_null(mask, False)).to_pylist()
+    shown = ", ".join(str(row + offset + 2) for row in rows[:MAX_REPORTED])
+    more = f" and {len(rows) - MAX_REPORTED} more" if len(rows) > MAX_REPORTED else ""
+    return f"line{'s' if len(rows) > 1 else ''} {shown}{more}"
+
+
+def _flag_rows(problems: list, label: str, mask, message: str, offset: int = 0) -> None:
+    if pc.any(pc.fill_null(mask, False)).as_py():
+        problems.append(f"{label}: {message} ({_lines(mask, offset)})")
+
+
+def _flag_names(problems: list, label: str, mask, names, message: str) -> None:
+    flagged = pc.filter(names, pc.fill_null(mask, False)).to_pylist()
+    if flagged:
+        problems.append(f"{label}: {message}: {', '.join(map(str, flagged[:MAX_REPORTED]))}"
+                        + (f" and {len(flagged) - MAX_REPORTED} more" if len(flagged) > MAX_REPORTED else ""))
+
+
+def _off(actual, expected, tolerance: float):
+    return pc.greater(pc.abs(pc.subtract(actual, expected)), tolerance)
+
+
+def _percent(part, whole):
+    return pc.multiply(pc.divide(pc.cast(part, pa.float64()), pc.cast(whole, pa.float64())), 100.0)
+
+
+def _flag_duplicates(problems: list, label: str, table: pa.Table, keys: list[str]) -> None:
+    counts = table.group_by(keys, use_threads=False).aggregate([(keys[0], 'count')])
+    repeated = pc.greater(counts[f"{keys[0]}_count"], 1)
+    names = counts[keys[0]] if len(keys) == 1 else pc.binary_join_element_wise(
+        *(counts[key] for key in keys), " / ")
+    _flag_names(problems, label, repeated, names, f"duplicate {' / '.join(keys)}")
+
+
+def _check_industry(table: pa.Table, label: str, problems: list) -> None:
+    headcount = table['headcount']
+    _flag_rows(problems, label, pc.less_equal(headcount, 0), "headcount must be positive")
+    _flag_duplicates(problems, label, table, ['sector', 'subsector'])
+    sectors = table.group_by('sector', use_threads=False).aggregate([
+        ('headcount', 'sum'), ('sector_pct', 'min'), ('sector_pct', 'max'), ('subsector_pct', 'sum'),
+    ]).combine_chunks()
+    names = sectors['sector']
+    _flag_names(problems, label, pc.not_equal(sectors['sector_pct_min'], sectors['sector_pct_max']),
+                names, "sector_pct differs between rows of the same sector")
+    sector_share = _percent(sectors['headcount_sum'], pc.sum(headcount))
+    _flag_names(problems, label, _off(sector_share, sectors['sector_pct_min'], SECTOR_PCT_TOLERANCE),
+                names, f"sector_pct is off the sector's share of headcount by more than {SECTOR_PCT_TOLERANCE:g}")
+    _flag_names(problems, label, _off(sectors['subsector_pct_sum'], 100.0, SUBSECTOR_PCT_TOLERANCE),
+                names, "subsector_pct does not add up to 100")
+    sector_headcount = pc.take(sectors['headcount_sum'], pc.index_in(table['sector'], value_set=names.chunk(0)))
+    _flag_rows(problems, label,
+               _off(_percent(headcount, sector_headcount), table['subsector_pct'], SUBSECTOR_PCT_TOLERANCE),
+               "subsector_pct does not match the subsector's share of its sector's headcount")
+
+
+def _check_salary(table: pa.Table, label: str, problems: list) -> None:
+    _flag_duplicates(problems, label, table, ['sector'])
+    _flag_rows(problems, label, pc.less_equal(table['min_salary'], 0), "min_salary must be positive")
+    _flag_rows(problems, label, pc.or_(pc.less(table['avg_salary'], table['min_salary']),
+                                       pc.greater(table['avg_salary'], table['max_salary'])),
+               "avg_salary must lie between min_salary and max_salary")
+    _flag_rows(problems, label,
+               pc.not_equal(table['salary_spread'], pc.subtract(table['max_salary'], table['min_salary'])),
+               "salary_spread must equal max_salary - min_salary")
+
+
+def _check_employers(table: pa.Table, label: str, problems: list, education_type: str) -> None:
+    _flag_rows(problems, label, pc.less_equal(table['headcount'], 0), "headcount must be positive")
+    _flag_rows(problems, label, pc.less_equal(table['avg_salary'], 0), "avg_salary must be positive")
+    _flag_rows(problems, label, pc.not_equal(table['education_type'], education_type),
+               f"education_type must be {education_type!r}")
+
+
+def _check_time_series(table: pa.Table, label: str, problems: list) -> None:
+    _flag_rows(problems, label, pc.less_equal(table['total_employees'], 0), "total_employees must be positive")
+    _flag_rows(problems, label, pc.or_(pc.less(table['new_hires'], 0), pc.less(table['departures'], 0)),
+               "new_hires and departures must not be negative")
+    _flag_rows(problems, label,
+               pc.not_equal(table['net_growth'], pc.subtract(table['new_hires'], table['departures'])),
+               "net_growth must equal new_hires - departures")
+    if table.num_rows < 2:
+        return
+    previous, current = table.slice(0, table.num_rows - 1), table.slice(1)
+    # Masks over `current` are one row below their position
+    _flag_rows(problems, label, pc.not_equal(pc.subtract(current['year'], previous['year']), 1),
+               "years must be consecutive", offset=1)
+    _flag_rows(problems, label,
+               pc.not_equal(current['total_employees'],
+                            pc.add(previous['total_employees'], previous['net_growth'])),
+               "total_employees must equal the previous year's plus its net_growth", offset=1)
+    _flag_rows(problems, label,
+               _off(_percent(current['net_growth'], current['total_employees']),
+                    current['growth_rate_pct'], GROWTH_RATE_TOLERANCE),
+               "growth_rate_pct must be net_growth as a percent of total_employees", offset=1)
+
+
+def _check_education(table: pa.Table, label: str, problems: list) -> None:
+    _flag_duplicates(problems, label, table, ['sector'])
+    college, no_college = table['college_required_pct'], table['no_college_required_pct']
+    _flag_rows(problems, label,
+               pc.or_(pc.or_(pc.less(college, 0), pc.greater(college, 100)),
+                      pc.or_(pc.less(no_college, 0), pc.greater(no_college, 100))),
+               "percentages must be between 0 and 100")
+    _flag_rows(problems, label, _off(pc.add(college, no_college), 100.0, EDUCATION_PCT_TOLERANCE),
+               "college_required_pct + no_college_required_pct must be 100")
+
+
+def _check_growth(table: pa.Table, label: str, problems: list) -> None:
+    _flag_duplicates(problems, label, table, ['sector'])
+
+
+TABLE_CHECKS = {
+    'industry': _check_industry,
+    'salary': _check_salary,
+    'noncollege_employers': lambda table, label, problems: _check_employers(
+        table, label, problems, EMPLOYER_EDUCATION_TYPES['noncollege_employers']),
+    'college_employers': lambda table, label, problems: _check_employers(
+        table, label, problems, EMPLOYER_EDUCATION_TYPES['college_employers']),
+    'time_series': _check_time_series,
+    'education': _check_education,
+    'growth': _check_growth,
+}
+
+
+def validate_metro(directory: str, tables: dict) -> tuple[str | None, list[str]]:
+    """Check one metro's parsed tables; return (metro key, problems)."""
+    problems = []
+    metro_key = None
+    for table_name, table in tables.items():
+        label = f"{directory}/{table_name}.csv"
+        expected = list(TABLE_SCHEMAS[table_name])
+        if table.column_names != expected:
+            problems.append(f"{label}: columns {table.column_names} do not match {expected}")
+            continue
+        if table.num_rows == 0:
+            problems.append(f"{label}: no rows")
+            continue
+        for name in expected:
+            column = table[name]
+            empty = pc.is_null(column)
+            if pa.types.is_string(column.type):
+                empty = pc.or_(empty, pc.equal(pc.utf8_trim_whitespace(column), ""))
+            _flag_rows(problems, label, empty, f"empty {name}")
+        metro_key = metro_key or table['metro'][0].as_py()
+        _flag_rows(problems, label, pc.not_equal(table['metro'], metro_key),
+                   f"metro must be {metro_key!r} throughout {directory}/")
+        TABLE_CHECKS[table_name](table, label, problems)
+
+    if 'industry' in tables and not problems:
+        sectors = set(tables['industry']['sector'].to_pylist())
+        for table_name in SECTOR_TABLES:
+            found = set(tables[table_name]['sector'].to_pylist())
+            if sectors - found:
+                problems.append(f"{directory}/{table_name}.csv: no rows for sectors in industry.csv: "
+                                f"{', '.join(sorted(sectors - found))}")
+            if found - sectors:
+                problems.append(f"{directory}/{table_name}.csv: sectors missing from industry.csv: "
+                                f"{', '.join(sorted(found - sectors))}")
+    return metro_key, problems
+
+
+def load_metro(metro_dir: Path) -> LoadedMetro:
+    """Parse and validate one metro directory (runs in a worker process for large rebuilds)."""
+    tables, problems = {}, []
+    for table_name in TABLE_SCHEMAS:
+        path = metro_dir / f"{table_name}.csv"
+        if not path.exists():
+            problems.append(f"{metro_dir.name}/{path.name}: missing")
+            continue
+        try:
+            tables[table_name] = read_table(path, table_name)
+        except pa.ArrowInvalid as exc:
+            problems.append(f"{metro_dir.name}/{path.name}: {exc}")
+    metro_key, table_problems = validate_metro(metro_dir.name, tables)
+    return LoadedMetro(metro_dir.name, metro_key, tables, problems + table_problems)
+
+
+def _load_metros(paths: list[Path], workers: int | None) -> list[LoadedMetro]:
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers > 1 and len(paths) >= PARALLEL_MIN_METROS:
+        # spawn keeps workers from inheriting the server's threads when run at app start
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(load_metro, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    return [load_metro(path) for path in paths]
+
+
+# ========== ALL-METRO COPIES ==========
+def _row_ranges(metros: list[str]) -> dict:
+    """Return {metro: [offset, length]} for a metro column sorted by metro."""
+    ranges = {}
+    for offset, metro in enumerate(metros):
+        if metro in ranges:
+            ranges[metro][1] += 1
+        else:
+            ranges[metro] = [offset, 1]
+    return ranges
+
+
+def check_combined(tables: dict, ranges: dict, directories: dict, data_dir: Path = DATA_DIR) -> list[str]:
+    """Compare each assembled table with its all_metros_<table>.csv copy, metro by metro."""
+    problems = []
+    for table_name, table in tables.items():
+        path = metro_store.source_path(table_name, data_dir)
+        if not path.exists():
+            continue
+        try:
+            combined = read_table(path, table_name)
+        except pa.ArrowInvalid as exc:
+            problems.append(f"{path.name}: {exc}")
+            continue
+        if combined.column_names != table.column_names:
+            problems.append(f"{path.name}: columns {combined.column_names} do not match {table.column_names}")
+            continue
+        # Stable sort keeps each metro's rows in their CSV order
+        combined = combined.take(pc.sort_indices(combined, sort_keys=[('metro', 'ascending')]))
+        if combined.equals(table):
+            continue
+        combined_ranges = _row_ranges(combined['metro'].to_pylist())
+        for metro_key in sorted(set(ranges[table_name]) | set(combined_ranges)):
+            if metro_key not in combined_ranges:
+                problems.append(f"{path.name}: no rows for {metro_key} ({directories[metro_key]}/ has them)")
+            elif metro_key not in ranges[table_name]:
+                problems.append(f"{path.name}: rows for {metro_key}, which has no metro directory")
+            elif not combined.slice(*combined_ranges[metro_key]).equals(table.slice(*ranges[table_name][metro_key])):
+                problems.append(f"{path.name}: rows for {metro_key} differ from "
+                                f"{directories[metro_key]}/{table_name}.csv")
+    return problems
+
+
+# ========== STORE ==========
+def _write_arrow(table: pa.Table, target: Path) -> None:
+    tmp_target = target.with_suffix(f".arrow.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_target), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp_target, target)
+
+
+def _encode(table: pa.Table, table_name: str) -> pa.Table:
+    """Dictionary-encode the low-cardinality text columns across every metro."""
+    columns = []
+    for name, dtype in TABLE_SCHEMAS[table_name].items():
+        column = table.column(name)
+        if pa.types.is_dictionary(dtype):
+            column = pc.dictionary_encode(column).cast(dtype)
+        columns.append(column)
+    return pa.Table.from_arrays(columns, names=list(TABLE_SCHEMAS[table_name]))
+
+
+def _previous_tables(store_dir: Path) -> dict:
+    """The current store's tables with plain text columns, to reuse unchanged metros' rows."""
+    tables = {}
+    for table_name in TABLE_SCHEMAS:
+        source = pa.memory_map(str(store_dir / f"{table_name}.arrow"), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        tables[table_name] = table.cast(pa.schema(metro_store.plain_types(table_name)))
+    return tables
+
+
+def _files_by_directory(fingerprint: dict) -> dict:
+    """Group a source fingerprint's per-metro entries by metro directory."""
+    grouped = {}
+    for name, stat in fingerprint.items():
+        directory, _, file_name = name.rpartition("/")
+        if directory:
+            grouped.setdefault(directory, {})[file_name] = stat
+    return grouped
+
+
+def compile_data(data_dir: Path = DATA_DIR, store_dir: Path = STORE_DIR, force: bool = False,
+                 check_only: bool = False, workers: int | None = None) -> CompileResult:
+    """Validate changed metros and rebuild the store, reusing unchanged metros' rows.
+
+    A metro directory whose files kept their size and mtime is not even
+    re-hashed. Raises ``DataValidationError`` (writing nothing) if any check
+    fails; with ``check_only`` every metro is validated and nothing is written.
+    """
+    started = time.perf_counter()
+    directories = metro_dirs(data_dir)
+    fingerprint = metro_store.source_fingerprint(data_dir)
+    previous = None if force or check_only else metro_store.read_index(store_dir)
+    if not previous or previous.get('version') != metro_store.STORE_VERSION \
+            or previous.get('compiler') != compiler_hash() \
+            or not all((store_dir / f"{table_name}.arrow").exists() for table_name in TABLE_SCHEMAS):
+        previous = {}
+    previous_metros = previous.get('metros', {})
+    previous_files = _files_by_directory(previous.get('sources', {}))
+    files = _files_by_directory(fingerprint)
+
+    digests = {
+        directory: previous_metros[directory]['hash']
+        if directory in previous_metros and previous_files.get(directory) == files.get(directory)
+        else metro_hash(path)
+        for directory, path in directories.items()
+    }
+    changed = [
+        directory for directory in directories
+        if previous_metros.get(directory, {}).get('hash') != digests[directory]
+    ]
+    loaded = {metro.directory: metro for metro in _load_metros([directories[d] for d in changed], workers)}
+    problems = [problem for metro in loaded.values() for problem in metro.problems]
+    metro_keys = {
+        directory: loaded[directory].metro_key if directory in loaded else previous_metros[directory]['metro']
+        for directory in directories
+    }
+    by_key = {}
+    for directory, metro_key in metro_keys.items():
+        if metro_key in by_key:
+            problems.append(f"{directory}/: metro {metro_key!r} is already in {by_key[metro_key]}/")
+        by_key.setdefault(metro_key, directory)
+    if problems:
+        raise DataValidationError(problems)
+
+    # Lay every table out in metro order; unchanged metros are zero-copy slices of the current store
+    reused = _previous_tables(store_dir) if len(changed) < len(directories) else {}
+    order = sorted(directories, key=lambda directory: metro_keys[directory])
+    tables, ranges = {}, {}
+    for table_name in TABLE_SCHEMAS:
+        parts, ranges[table_name], offset = [], {}, 0
+        for directory in order:
+            metro_key = metro_keys[directory]
+            part = (loaded[directory].tables[table_name] if directory in loaded
+                    else reused[table_name].slice(*previous['tables'][table_name][metro_key]))
+            parts.append(part)
+            ranges[table_name][metro_key] = [offset, part.num_rows]
+            offset += part.num_rows
+        tables[table_name] = pa.concat_tables(parts).combine_chunks()
+
+    problems = check_combined(tables, ranges, by_key, data_dir)
+    if problems:
+        raise DataValidationError(problems)
+    index = {
+        'version': metro_store.STORE_VERSION,
+        'compiler': compiler_hash(),
+        'sources': fingerprint,
+        'metros': {directory: {'hash': digests[directory], 'metro': metro_keys[directory]} for directory in order},
+        'tables': ranges,
+    }
+    if not check_only:
+        store_dir.mkdir(parents=True, exist_ok=True)
+        for table_name, table in tables.items():
+            _write_arrow(_encode(table, table_name), store_dir / f"{table_name}.arrow")
+        tmp_index = store_dir / f"{metro_store.INDEX_FILE}.{os.getpid()}.tmp"
+        tmp_index.write_text(json.dumps(index, indent=2, sort_keys=True))
+        os.replace(tmp_index, store_dir / metro_store.INDEX_FILE)
+    return CompileResult(index, changed, len(directories), time.perf_counter() - started)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate game_data and compile it into the Arrow store")
+    parser.add_argument("--force", action="store_true", help="recompile every metro")
+    parser.add_argument("--check", action="store_true", help="validate every metro and write nothing")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--store-dir", type=Path, default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        result = compile_data(args.data_dir, args.store_dir, force=args.force,
+                              check_only=args.check, workers=args.workers)
+    except DataValidationError as exc:
+        for problem in exc.problems:
+            print(f"invalid: {problem}")
+        return 1
+    if args.check:
+        print(f"Validated {result.metros} metros in {result.seconds:.2f}s")
+    else:
+        shown = ", ".join(result.compiled[:10]) + (" ..." if len(result.compiled) > 10 else "")
+        print(f"Compiled {len(result.compiled)} of {result.metros} metros in {result.seconds:.2f}s"
+              + (f" ({shown})" if result.compiled else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
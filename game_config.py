@@ -0,0 +1,221 @@
+"""Shared game configuration: metros, chart sizing and color palettes.
+
+Kept free of Streamlit imports so figure builders and offline tools can use it.
+"""
+
+# ========== METRO CONFIGURATION ==========
+METROS = {
+    'Memphis': {
+        'name': 'Memphis, TN',
+        'state': 'Tennessee',
+        'highlights': [
+            "FedEx keeps Memphis the global air cargo capital with the world's busiest cargo airport.",
+            "Healthcare anchors like St. Jude and Methodist Le Bonheur fuel a fast-growing biosciences corridor.",
+            "Advanced manufacturers and logistics firms lean on the Mississippi River port and rail crossroads for scale.",
+            "Cultural energy plus low costs continue to attract professional services and tech expansions."
+        ]
+    },
+    'Charlotte': {
+        'name': 'Charlotte, NC',
+        'state': 'North Carolina',
+        'highlights': [
+            "Bank of America and Wells Fargo anchor Charlotte as the nation's second-largest banking center after New York.",
+            "The metro's finance sector employs over 60,000 workers with competitive salaries and rapid growth.",
+            "Charlotte Douglas International Airport is a major American Airlines hub, driving logistics employment.",
+            "Healthcare systems like Atrium Health are expanding rapidly, creating thousands of high-skill jobs."
+        ]
+    },
+    'DC': {
+        'name': 'Washington DC',
+        'state': 'District of Columbia',
+        'highlights': [
+            "Federal government agencies dominate employment with over 350,000 workers in the metro area.",
+            "The highest average salaries in the dataset reflect government and contractor pay premiums.",
+            "Professional services firms like Booz Allen Hamilton cluster around federal contracts.",
+            "Technology sector growing rapidly as defense and intelligence agencies modernize systems."
+        ]
+    },
+    'Pittsburgh': {
+        'name': 'Pittsburgh, PA',
+        'state': 'Pennsylvania',
+        'highlights': [
+            "UPMC (University of Pittsburgh Medical Center) is the region's largest employer with over 40,000 workers.",
+            "Carnegie Mellon and University of Pittsburgh anchor a growing tech and robotics ecosystem.",
+            "Healthcare and education sectors dominate, creating stable, high-skill employment.",
+            "Former steel town successfully transitioned to 'eds and meds' economy with tech growth."
+        ]
+    },
+    'Houston': {
+        'name': 'Houston, TX',
+        'state': 'Texas',
+        'highlights': [
+            "ExxonMobil, Shell, and dozens of energy companies make Houston the global energy capital.",
+            "The energy sector provides high-paying jobs with strong five-year growth projections.",
+            "MD Anderson Cancer Center and Texas Medical Center create a healthcare employment powerhouse.",
+            "Port of Houston ranks first in U.S. foreign tonnage, driving massive logistics employment."
+        ]
+    }
+}
+
+# List of all metro names for dropdown (will exclude answer)
+# 150+ US metropolitan areas with state abbreviations
+ALL_METRO_NAMES = [
+    'Akron, OH', 'Albany, NY', 'Albuquerque, NM', 'Allentown, PA', 'Amarillo, TX',
+    'Anchorage, AK', 'Ann Arbor, MI', 'Asheville, NC', 'Atlanta, GA', 'Augusta, GA',
+    'Austin, TX', 'Bakersfield, CA', 'Baltimore, MD', 'Baton Rouge, LA', 'Beaumont, TX',
+    'Boise, ID', 'Boston, MA', 'Boulder, CO', 'Bridgeport, CT', 'Brownsville, TX',
+    'Buffalo, NY', 'Cape Coral, FL', 'Cedar Rapids, IA', 'Charleston, SC', 'Charlotte, NC',
+    'Chattanooga, TN', 'Chicago, IL', 'Cincinnati, OH', 'Clarksville, TN', 'Cleveland, OH',
+    'Colorado Springs, CO', 'Columbia, SC', 'Columbus, GA', 'Columbus, OH', 'Corpus Christi, TX',
+    'Dallas, TX', 'Dayton, OH', 'Daytona Beach, FL', 'Deltona, FL', 'Denver, CO',
+    'Des Moines, IA', 'Detroit, MI', 'Durham, NC', 'El Paso, TX', 'Eugene, OR',
+    'Evansville, IN', 'Fargo, ND', 'Fayetteville, AR', 'Fayetteville, NC', 'Flint, MI',
+    'Fort Collins, CO', 'Fort Myers, FL', 'Fort Wayne, IN', 'Fort Worth, TX', 'Fresno, CA',
+    'Gainesville, FL', 'Grand Rapids, MI', 'Green Bay, WI', 'Greensboro, NC', 'Greenville, SC',
+    'Harrisburg, PA', 'Hartford, CT', 'Honolulu, HI', 'Houston, TX', 'Huntsville, AL',
+    'Indianapolis, IN', 'Jackson, MS', 'Jacksonville, FL', 'Jersey City, NJ', 'Kalamazoo, MI',
+    'Kansas City, MO', 'Killeen, TX', 'Knoxville, TN', 'Lafayette, LA', 'Lakeland, FL',
+    'Lancaster, PA', 'Lansing, MI', 'Laredo, TX', 'Las Vegas, NV', 'Lexington, KY',
+    'Lincoln, NE', 'Little Rock, AR', 'Los Angeles, CA', 'Louisville, KY', 'Lubbock, TX',
+    'Madison, WI', 'Manchester, NH', 'McAllen, TX', 'Memphis, TN', 'Miami, FL',
+    'Milwaukee, WI', 'Minneapolis, MN', 'Mobile, AL', 'Modesto, CA', 'Montgomery, AL',
+    'Myrtle Beach, SC', 'Nashville, TN', 'New Haven, CT', 'New Orleans, LA', 'New York, NY',
+    'Newark, NJ', 'Norfolk, VA', 'North Port, FL', 'Ogden, UT', 'Oklahoma City, OK',
+    'Omaha, NE', 'Orlando, FL', 'Oxnard, CA', 'Palm Bay, FL', 'Pensacola, FL',
+    'Peoria, IL', 'Philadelphia, PA', 'Phoenix, AZ', 'Pittsburgh, PA', 'Portland, ME',
+    'Portland, OR', 'Providence, RI', 'Provo, UT', 'Raleigh, NC', 'Reading, PA',
+    'Reno, NV', 'Richmond, VA', 'Riverside, CA', 'Rochester, NY', 'Rockford, IL',
+    'Sacramento, CA', 'Salem, OR', 'Salinas, CA', 'Salt Lake City, UT', 'San Antonio, TX',
+    'San Diego, CA', 'San Francisco, CA', 'San Jose, CA', 'Santa Barbara, CA', 'Santa Rosa, CA',
+    'Savannah, GA', 'Scranton, PA', 'Seattle, WA', 'Shreveport, LA', 'Spokane, WA',
+    'Springfield, IL', 'Springfield, MA', 'Springfield, MO', 'St Louis, MO', 'Stamford, CT',
+    'Stockton, CA', 'Syracuse, NY', 'Tacoma, WA', 'Tallahassee, FL', 'Tampa, FL',
+    'Toledo, OH', 'Topeka, KS', 'Trenton, NJ', 'Tucson, AZ', 'Tulsa, OK',
+    'Tuscaloosa, AL', 'Tyler, TX', 'Utica, NY', 'Vallejo, CA', 'Virginia Beach, VA',
+    'Visalia, CA', 'Waco, TX', 'Washington DC', 'Wichita, KS', 'Wilmington, NC',
+    'Winston-Salem, NC', 'Worcester, MA', 'York, PA', 'Youngstown, OH'
+]
+
+# Small-int metro IDs (positions in ALL_METRO_NAMES) that game state stores
+# in place of names; they only live in session memory
+METRO_IDS = {name: metro_id for metro_id, name in enumerate(ALL_METRO_NAMES)}
+
+# Common nicknames and abbreviations the guess search also matches
+METRO_ALIASES = {
+    'ATL': 'Atlanta, GA', 'Bay Area': 'San Francisco, CA', 'Beantown': 'Boston, MA',
+    'Big Apple': 'New York, NY', 'Chi-Town': 'Chicago, IL', 'DC': 'Washington DC',
+    'DFW': 'Dallas, TX', 'DMV': 'Washington DC', 'H-Town': 'Houston, TX',
+    'Inland Empire': 'Riverside, CA', 'KC': 'Kansas City, MO', 'LA': 'Los Angeles, CA',
+    'Motor City': 'Detroit, MI', 'Music City': 'Nashville, TN', 'NOLA': 'New Orleans, LA',
+    'NYC': 'New York, NY', 'OKC': 'Oklahoma City, OK', 'Philly': 'Philadelphia, PA',
+    'Research Triangle': 'Raleigh, NC', 'SF': 'San Francisco, CA', 'SLC': 'Salt Lake City, UT',
+    'STL': 'St Louis, MO', 'Silicon Valley': 'San Jose, CA', 'Steel City': 'Pittsburgh, PA',
+    'Twin Cities': 'Minneapolis, MN', 'Vegas': 'Las Vegas, NV', 'Queen City': 'Charlotte, NC',
+    'Bluff City': 'Memphis, TN', 'Space City': 'Houston, TX', 'Hampton Roads': 'Virginia Beach, VA',
+}
+
+# ========== DEVELOPER CONFIGURATION ==========
+UI_SCALE = 1.0
+CHART_HEIGHT_SCALE = 0.88
+CHART_TEXT_SCALE = 0.90
+
+CHART_CONFIG = {
+    'treemap': {
+        'scale': 1.1, 
+        'text': 1.0,
+        'margin': {'t': 20, 'l': 18, 'r': 18, 'b': 22}
+    },
+    'salary': {
+        'scale': 0.9,
+        'text': 1.0,
+        'margin': {'t': 20, 'l': 18, 'r': 80, 'b': 24}
+    },
+    'growth_bar': {
+        'scale': 0.9,
+        'text': 1.0,
+        'margin': {'t': 20, 'l': 18, 'r': 14, 'b': 24}
+    },
+    'growth_line': {
+        'scale': 0.9,
+        'text': 1.0,
+        'margin': {'t': 20, 'l': 18, 'r': 14, 'b': 24}
+    },
+    'percentiles': {
+        'scale': 0.9,
+        'text': 0.80,
+        'margin': {'t': 50, 'l': 14, 'r': 14, 'b': 20}
+    },
+    'score_distribution': {
+        'scale': 1.3,
+        'text': 1.4,
+        'margin': {'t': 50, 'l': 40, 'r': 30, 'b': 40}
+    },
+    'employers': {
+        'scale': 1.2,
+        'text': 1.5,
+        'margin': {'t': 70, 'l': 16, 'r': 100, 'b': 36}
+    },
+    'hud_score': {
+        'height': 40,
+        'margin': {'t': 2, 'b': 2, 'l': 4, 'r': 4},
+        'text': 1.6
+    }
+}
+
+SCORE_DISTRIBUTION_PROFILES = {
+    'Memphis': {'mean': 33, 'std': 7},
+    'Charlotte': {'mean': 41, 'std': 6},
+    'DC': {'mean': 39, 'std': 5},
+    'Pittsburgh': {'mean': 31, 'std': 8},
+    'Houston': {'mean': 44, 'std': 5}
+}
+
+DEFAULT_SCORE_PROFILE = {'mean': 36, 'std': 7}
+
+# ========== COLOR PALETTES ==========
+REVELIO_PALETTE = {
+    "primary": "#0066FF",
+    "secondary": "#00CC88",
+    "accent": "#FF6B6B",
+    "purple": "#8B5CF6",
+    "gray": "#64748B",
+    "light_gray": "#94A3B8",
+    "grid": "#E2E8F0",
+    "text": "#1E293B",
+    "background": "#FFFFFF",
+    "subtle_bg": "#F8FAFC",
+}
+
+SECTOR_COLORS = {
+    'Logistics & Transportation': '#4A90E2',
+    'Healthcare': '#50C878',
+    'Manufacturing': '#9B7EDE',
+    'Retail & Hospitality': '#FF9F6B',
+    'Professional Services': '#5BC0BE',
+    'Technology': '#A78BFA',
+    'Education': '#FB7185',
+    'Financial Services': '#60A5FA',
+    'Construction': '#FCD34D',
+    'Government': '#94A3B8',
+    'Energy & Utilities': '#F59E0B',
+    'Real Estate': '#10B981',
+    'Media & Entertainment': '#EC4899',
+    'Non-Profit': '#6366F1'
+}
+
+
+# ========== CHART SIZING HELPERS ==========
+def get_chart_height(chart_type, base_height):
+    """Scale chart height based on individual chart configuration"""
+    scale = CHART_CONFIG.get(chart_type, {}).get('scale', 1.0)
+    return int(base_height * scale * CHART_HEIGHT_SCALE)
+
+def get_text_size(chart_type, base_size):
+    """Scale text size based on individual chart configuration"""
+    scale = CHART_CONFIG.get(chart_type, {}).get('text', 1.0)
+    return int(base_size * scale * CHART_TEXT_SCALE)
+
+def get_margin(chart_type, defaults=None):
+    """Get margin configuration for a chart type"""
+    margin = CHART_CONFIG.get(chart_type, {}).get('margin', defaults or {})
+    return margin if margin else defaults
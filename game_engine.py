@@ -0,0 +1,193 @@
+"""Headless game rules for Guess the Metro.
+
+A round is a ``GameState`` advanced by a deterministic reducer over three
+events: ``Guess``, ``RevealHint`` and ``Reset``. Nothing here imports
+Streamlit, so the rules can be load-tested and fuzzed on their own::
+
+    python game_engine.py --games 1000000
+"""
+import argparse
+import random
+import time
+
+MAX_GUESSES = 5
+MAX_SCORE = 50
+WRONG_GUESS_PENALTY = 10
+TOTAL_HINTS = 5
+FIRST_HINT = 1  # the first hint is free
+ALL_HINTS = (1 << TOTAL_HINTS) - 1
+
+
+class GameState:
+    """One round: the mystery metro, guesses so far, revealed hints and score.
+
+    Guesses are small-int metro IDs (``game_config.METRO_IDS``) and revealed
+    hints a bitmask, so a round in session memory is a handful of cached ints.
+    """
+
+    __slots__ = ('mystery_metro', 'answer', 'guesses', 'hints', 'score', 'game_over', 'game_won')
+
+    def __init__(self, mystery_metro: str, answer: int, guesses: tuple = (), hints: int = FIRST_HINT,
+                 score: int = MAX_SCORE, game_over: bool = False, game_won: bool = False):
+        self.mystery_metro = mystery_metro
+        self.answer = answer    # metro ID of the mystery metro
+        self.guesses = guesses  # (metro ID, ...) in guess order
+        self.hints = hints      # bit i set once hint i is revealed
+        self.score = score
+        self.game_over = game_over
+        self.game_won = game_won
+
+    @property
+    def guesses_made(self) -> int:
+        return len(self.guesses)
+
+    @property
+    def guesses_left(self) -> int:
+        return MAX_GUESSES - len(self.guesses)
+
+    @property
+    def revealed_hints(self) -> tuple[int, ...]:
+        """Indexes of the revealed hints, in reveal order."""
+        return tuple(index for index in range(TOTAL_HINTS) if self.hints >> index & 1)
+
+    @property
+    def hints_revealed(self) -> int:
+        return self.hints.bit_count()
+
+    @property
+    def has_more_hints(self) -> bool:
+        return self.hints != ALL_HINTS
+
+    def guess_results(self) -> list[tuple[int, bool]]:
+        """Return (metro ID, was correct) for each guess."""
+        return [(metro_id, metro_id == self.answer) for metro_id in self.guesses]
+
+    def replace(self, **changes) -> "GameState":
+        """Return a copy with some fields changed."""
+        state = GameState.__new__(GameState)
+        for name in GameState.__slots__:
+            setattr(state, name, changes.get(name, getattr(self, name)))
+        return state
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in GameState.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in GameState.__slots__)
+        return f"GameState({fields})"
+
+
+# ========== EVENTS ==========
+class Guess:
+    """The player submits a metro (by metro ID)."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: int | None):
+        self.value = value
+
+
+class RevealHint:
+    """The next hint is revealed (after a wrong guess)."""
+
+    __slots__ = ()
+
+
+class Reset:
+    """Start a new round for a mystery metro."""
+
+    __slots__ = ('mystery_metro', 'answer')
+
+    def __init__(self, mystery_metro: str, answer: int):
+        self.mystery_metro = mystery_metro
+        self.answer = answer
+
+
+REVEAL_HINT = RevealHint()
+
+
+def new_game(mystery_metro: str, answer: int) -> GameState:
+    """Return the opening state for a round: first hint free, full score."""
+    return GameState(mystery_metro, answer)
+
+
+def reduce(state: GameState, event) -> GameState:
+    """Apply one event to a state and return the next state.
+
+    Events that don't apply (guessing after the round ended, revealing past
+    the last hint) return the state unchanged.
+    """
+    if type(event) is Guess:
+        if state.game_over or event.value is None:
+            return state
+        guesses = state.guesses + (event.value,)
+        if event.value == state.answer:
+            return state.replace(guesses=guesses, game_over=True, game_won=True)
+        if len(guesses) >= MAX_GUESSES:
+            return state.replace(guesses=guesses, score=0, game_over=True, game_won=False)
+        return state.replace(guesses=guesses, score=max(state.score - WRONG_GUESS_PENALTY, 0))
+
+    if type(event) is RevealHint:
+        if not state.has_more_hints:
+            return state
+        # hints | (hints + 1) sets the lowest unset bit: the next hint in order
+        return state.replace(hints=state.hints | (state.hints + 1))
+
+    if type(event) is Reset:
+        return new_game(event.mystery_metro, event.answer)
+
+    raise TypeError(f"Unknown game event: {event!r}")
+
+
+# ========== SIMULATION ==========
+def play_random_game(rng: random.Random, metros: dict, candidates: list[int]) -> GameState:
+    """Play one round with uniformly random guesses; reveal a hint after each miss."""
+    mystery_metro = rng.choice(list(metros))
+    state = new_game(mystery_metro, metros[mystery_metro])
+    while not state.game_over:
+        state = reduce(state, Guess(rng.choice(candidates)))
+        if not state.game_over:
+            state = reduce(state, REVEAL_HINT)
+    return state
+
+
+def simulate(games: int, seed: int = 0, metros: dict | None = None, candidates: list[int] | None = None) -> dict:
+    """Play many random rounds and return aggregate results and throughput."""
+    from game_config import METRO_IDS, METROS
+
+    if metros is None:
+        metros = {key: METRO_IDS[info['name']] for key, info in METROS.items()}
+    if candidates is None:
+        candidates = list(METRO_IDS.values())
+    rng = random.Random(seed)
+    wins = 0
+    score_total = 0
+    started = time.perf_counter()
+    for _ in range(games):
+        state = play_random_game(rng, metros, candidates)
+        wins += state.game_won
+        score_total += state.score
+    elapsed = time.perf_counter() - started
+    return {
+        'games': games,
+        'wins': wins,
+        'average_score': score_total / games if games else 0.0,
+        'seconds': elapsed,
+        'games_per_minute': games / elapsed * 60 if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate random games against the headless engine")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    result = simulate(args.games, args.seed)
+    print(
+        f"{result['games']:,} games in {result['seconds']:.2f}s "
+        f"({result['games_per_minute']:,.0f} games/min), "
+        f"win rate {result['wins'] / max(result['games'], 1):.2%}, "
+        f"average score {result['average_score']:.1f}"
+    )
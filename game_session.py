@@ -0,0 +1,88 @@
+"""Per-session state for the app, kept in one compact slotted object.
+
+Each browser session stores a single ``GameSession`` under
+``st.session_state.game`` instead of a dozen loose keys: the engine's
+``GameState`` (guesses as small-int metro IDs, revealed hints as a bitmask),
+the UI flags packed into one int, and the little else a session carries
+between reruns. Live sessions are tracked in a weak registry so the memory
+report can size them without reaching into Streamlit's internals.
+"""
+import threading
+import weakref
+
+import game_engine
+
+# UI flags, one bit of GameSession.flags each
+HIDE_INTRO = 1 << 0
+SHOW_RESULT_MODAL = 1 << 1
+WIN_ANIMATION_PENDING = 1 << 2
+LAST_GUESS_WRONG = 1 << 3
+HINT_UNLOCKING = 1 << 4
+HINT_JUST_REVEALED = 1 << 5
+# Flags that outlive a round
+SESSION_FLAGS = HIDE_INTRO
+
+
+class _Flag:
+    """A boolean attribute stored as one bit of ``GameSession.flags``."""
+
+    __slots__ = ('bit',)
+
+    def __init__(self, bit: int):
+        self.bit = bit
+
+    def __get__(self, session, owner=None):
+        if session is None:
+            return self
+        return bool(session.flags & self.bit)
+
+    def __set__(self, session, value: bool) -> None:
+        session.flags = session.flags | self.bit if value else session.flags & ~self.bit
+
+
+class GameSession:
+    """The current round, UI flags and picker/rerun bookkeeping of one session."""
+
+    __slots__ = ('game', 'flags', 'puzzle_day', 'search_page', 'rerun_cause', 'race', '__weakref__')
+
+    hide_intro = _Flag(HIDE_INTRO)
+    show_result_modal = _Flag(SHOW_RESULT_MODAL)
+    win_animation_pending = _Flag(WIN_ANIMATION_PENDING)
+    last_guess_wrong = _Flag(LAST_GUESS_WRONG)
+    hint_unlocking = _Flag(HINT_UNLOCKING)        # the wrong-guess toast says a hint is coming
+    hint_just_revealed = _Flag(HINT_JUST_REVEALED)
+
+    def __init__(self):
+        self.game = None          # game_engine.GameState once a round starts
+        self.flags = 0
+        self.puzzle_day = None    # date of the daily puzzle being played, None in practice rounds
+        self.search_page = None   # (query, offset) of the guess picker's result page
+        self.rerun_cause = None   # why the next script run was requested, for perf
+        self.race = None          # (room code, player ID) while in a race room (race_hub.py)
+        with _sessions_lock:
+            _sessions.add(self)
+
+    def start(self, game: game_engine.GameState, puzzle_day=None) -> None:
+        """Begin a new round and clear the per-round UI flags."""
+        self.game = game
+        self.puzzle_day = puzzle_day
+        self.flags &= SESSION_FLAGS
+
+    def take_rerun_cause(self, default: str | None = 'interaction') -> str | None:
+        """Return and clear the cause recorded for this run."""
+        cause, self.rerun_cause = self.rerun_cause, None
+        return cause or default
+
+    def __repr__(self) -> str:
+        return (f"GameSession(game={self.game!r}, flags={self.flags:#04x}, puzzle_day={self.puzzle_day!r}, "
+                f"search_page={self.search_page!r}, race={self.race!r})")
+
+
+_sessions = weakref.WeakSet()
+_sessions_lock = threading.Lock()
+
+
+def live_sessions() -> list[GameSession]:
+    """Every GameSession still referenced by a Streamlit session in this process."""
+    with _sessions_lock:
+        return list(_sessions)
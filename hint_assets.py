@@ -0,0 +1,242 @@
+"""Offline build of pre-rendered hint figures with a content-hashed manifest.
+
+Usage::
+
+    python hint_assets.py            # rebuild only entries whose inputs changed
+    python hint_assets.py --force    # rebuild everything
+    python hint_assets.py --check    # exit 1 if any asset is missing or stale
+
+Each (metro, hint) figure list is written to ``hint_assets/<metro>/`` as
+Plotly JSON. ``hint_assets/manifest.json`` records the hash of the inputs
+that produced it (the metro's source rows, or every metro's for cross-metro
+hints, plus the chart configuration and the figure builder code) and its
+size, so the app can load assets whose hash still matches and reviewers can
+see asset sizes in diffs. Sizes and trace counts are held to
+``FIGURE_BUDGETS`` (per gauge for the comparison hint).
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import plotly.io as pio
+
+import hint_figures
+import metro_store
+from game_config import METROS
+
+BASE_DIR = Path(__file__).resolve().parent
+ASSET_DIR = BASE_DIR / "hint_assets"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Source files whose code shapes the figures; editing them invalidates every asset
+BUILDER_SOURCES = ("hint_figures.py", "metro_records.py", "game_config.py", "percentile_engine.py")
+
+# Ceilings on each hint's serialized figure JSON and trace count. Every
+# asset is checked against them on build and by --check, so a builder that
+# starts emitting per-row traces or bloated JSON fails CI instead of
+# slipping into the rerun payload.
+FIGURE_BUDGETS = {
+    'industry': {'bytes': 14_000, 'traces': 1},
+    'salary': {'bytes': 5_000, 'traces': 3},
+    'growth': {'bytes': 3_000, 'traces': 1},
+    'employers': {'bytes': 3_500, 'traces': 1},
+}
+# The comparison hint draws one gauge per percentile metric, so its budget
+# scales with percentile_engine.METRICS
+GAUGE_BUDGET = {'bytes': 1_500, 'traces': 1}
+
+
+@lru_cache(maxsize=1)
+def builder_hash() -> str:
+    """Hash of the figure builder code and chart configuration"""
+    digest = hashlib.sha256(hint_figures.CONFIG_HASH.encode("utf-8"))
+    for name in BUILDER_SOURCES:
+        digest.update((BASE_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _metro_hashes() -> dict:
+    return metro_store.metro_source_hashes()
+
+
+@lru_cache(maxsize=1)
+def _all_metros_hash() -> str:
+    hashes = _metro_hashes()
+    return hashlib.sha256("".join(hashes[metro] for metro in sorted(hashes)).encode("utf-8")).hexdigest()
+
+
+def input_hash(metro_key: str, hint_key: str) -> str:
+    """Hash of everything a hint's figures are built from"""
+    if hint_key in hint_figures.CROSS_METRO_HINTS:
+        data_hash = _all_metros_hash()
+    else:
+        data_hash = _metro_hashes().get(metro_key, '')
+    payload = f"{metro_key}\0{hint_key}\0{data_hash}\0{builder_hash()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def asset_key(metro_key: str, hint_key: str) -> str:
+    return f"{metro_key}/{hint_key}"
+
+
+# ========== RUNTIME LOADING ==========
+def read_manifest(asset_dir: Path = ASSET_DIR) -> dict:
+    """Return the manifest, or an empty one if it is missing or unreadable"""
+    try:
+        manifest = json.loads((asset_dir / MANIFEST_FILE).read_text())
+    except (FileNotFoundError, ValueError):
+        return {'version': MANIFEST_VERSION, 'assets': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'assets': {}}
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def _runtime_manifest() -> dict:
+    return read_manifest()
+
+
+def load_hint_json(metro_key: str, hint_key: str, asset_dir: Path = ASSET_DIR) -> list[str] | None:
+    """Return a hint's pre-rendered figure JSON if its asset is current, else None"""
+    manifest = _runtime_manifest() if asset_dir == ASSET_DIR else read_manifest(asset_dir)
+    entry = manifest['assets'].get(asset_key(metro_key, hint_key))
+    if not entry or entry['hash'] != input_hash(metro_key, hint_key):
+        return None
+    try:
+        return json.loads((asset_dir / entry['file']).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def load_hint_figures(metro_key: str, hint_key: str):
+    """Return a hint's pre-rendered figures if its asset is current, else None"""
+    figure_json = load_hint_json(metro_key, hint_key)
+    if figure_json is None:
+        return None
+    return [pio.from_json(item) for item in figure_json]
+
+
+# ========== BUILD ==========
+def _write_asset(asset_dir: Path, metro_key: str, hint_key: str, digest: str, figures) -> dict:
+    figure_json = [fig.to_json() for fig in figures]
+    content = json.dumps(figure_json)
+    relative = Path(metro_key) / f"{hint_key}.{digest[:12]}.json"
+    target = asset_dir / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_suffix(f".{os.getpid()}.tmp")
+    tmp_target.write_text(content)
+    os.replace(tmp_target, target)
+    return {
+        'hash': digest,
+        'file': relative.as_posix(),
+        'bytes': len(content.encode("utf-8")),
+        'traces': sum(len(fig.data) for fig in figures),
+    }
+
+
+def build_assets(asset_dir: Path = ASSET_DIR, force: bool = False) -> tuple[dict, list[str]]:
+    """Build every stale asset and return (manifest, rebuilt asset keys)"""
+    hint_figures.register_plotly_template()
+    manifest = read_manifest(asset_dir)
+    assets = {}
+    rebuilt = []
+    for metro_key in METROS:
+        for hint_key in hint_figures.HINT_FIGURE_BUILDERS:
+            key = asset_key(metro_key, hint_key)
+            digest = input_hash(metro_key, hint_key)
+            entry = manifest['assets'].get(key)
+            if not force and entry and entry['hash'] == digest and (asset_dir / entry['file']).exists():
+                assets[key] = entry
+                continue
+            figures = hint_figures.build_hint(metro_key, hint_key)
+            assets[key] = _write_asset(asset_dir, metro_key, hint_key, digest, figures)
+            rebuilt.append(key)
+
+    # Remove files no longer referenced by the manifest
+    referenced = {entry['file'] for entry in assets.values()}
+    for path in asset_dir.glob("*/*.json"):
+        if path.relative_to(asset_dir).as_posix() not in referenced:
+            path.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'config_hash': hint_figures.CONFIG_HASH,
+        'builder_hash': builder_hash(),
+        'assets': dict(sorted(assets.items())),
+    }
+    (asset_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest, rebuilt
+
+
+def figure_budget(hint_key: str) -> dict | None:
+    """Size and trace ceilings for a hint's assets (None if unbudgeted)"""
+    if hint_key == 'comparison':
+        import percentile_engine  # imported lazily: it needs pandas, and the app only loads assets
+
+        gauges = len(percentile_engine.METRICS)
+        return {field: limit * gauges for field, limit in GAUGE_BUDGET.items()}
+    return FIGURE_BUDGETS.get(hint_key)
+
+
+def over_budget(manifest: dict) -> list[str]:
+    """Return a message for every asset whose size or trace count exceeds its budget"""
+    problems = []
+    for key, entry in manifest['assets'].items():
+        budget = figure_budget(key.rsplit("/", 1)[-1])
+        if not budget:
+            continue
+        for field in ('bytes', 'traces'):
+            if entry[field] > budget[field]:
+                problems.append(f"{key}: {entry[field]:,} {field} exceeds budget of {budget[field]:,}")
+    return problems
+
+
+def stale_assets(asset_dir: Path = ASSET_DIR) -> list[str]:
+    """Return the asset keys that are missing or out of date"""
+    manifest = read_manifest(asset_dir)
+    stale = []
+    for metro_key in METROS:
+        for hint_key in hint_figures.HINT_FIGURE_BUILDERS:
+            entry = manifest['assets'].get(asset_key(metro_key, hint_key))
+            if (not entry or entry['hash'] != input_hash(metro_key, hint_key)
+                    or not (asset_dir / entry['file']).exists()):
+                stale.append(asset_key(metro_key, hint_key))
+    return stale
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-render hint figures into hint_assets/")
+    parser.add_argument("--force", action="store_true", help="rebuild every asset")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any asset is missing or stale")
+    parser.add_argument("--output", type=Path, default=ASSET_DIR, help="asset directory")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = stale_assets(args.output)
+        for key in stale:
+            print(f"stale: {key}")
+        problems = over_budget(read_manifest(args.output))
+        for problem in problems:
+            print(f"over budget: {problem}")
+        return 1 if stale or problems else 0
+
+    manifest, rebuilt = build_assets(args.output, force=args.force)
+    for key, entry in manifest['assets'].items():
+        marker = "*" if key in rebuilt else " "
+        print(f"{marker} {key:<28} {entry['bytes']:>9,} bytes  {entry['traces']:>3} traces")
+    total = sum(entry['bytes'] for entry in manifest['assets'].values())
+    print(f"Rebuilt {len(rebuilt)} of {len(manifest['assets'])} assets ({total:,} bytes total)")
+    problems = over_budget(manifest)
+    for problem in problems:
+        print(f"over budget: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,627 @@
+"""Pure Plotly figure builders for the hint charts.
+
+Nothing here touches Streamlit, so figures can be built in worker processes
+during warm-up and by offline tools, then rendered by the app.
+"""
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
+from textwrap import wrap
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import metro_records
+from caching import LRUCache
+from game_config import (
+    CHART_CONFIG,
+    CHART_HEIGHT_SCALE,
+    CHART_TEXT_SCALE,
+    METROS,
+    REVELIO_PALETTE,
+    SECTOR_COLORS,
+    get_chart_height,
+    get_margin,
+    get_text_size,
+)
+
+
+def get_percentile_suffix(value: int) -> str:
+    """Return ordinal suffix with Percentile label for gauge numbers."""
+    if 10 <= value % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(value % 10, 'th')
+    return f"{suffix} Percentile"
+
+
+# ========== PLOTLY TEMPLATE ==========
+def register_plotly_template():
+    """Register custom Plotly template 'revelio_min'"""
+    revelio_template = go.layout.Template()
+    
+    revelio_template.layout = go.Layout(
+        font=dict(
+            family="Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif",
+            size=15,
+            color=REVELIO_PALETTE["text"]
+        ),
+        paper_bgcolor="white",
+        plot_bgcolor="white",
+        xaxis=dict(
+            showgrid=True,
+            gridcolor=REVELIO_PALETTE["grid"],
+            gridwidth=1,
+            zeroline=False,
+            showline=False,
+            tickfont=dict(size=14)
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor=REVELIO_PALETTE["grid"],
+            gridwidth=1,
+            zeroline=False,
+            showline=False,
+            tickfont=dict(size=14)
+        ),
+        legend=dict(
+            orientation="h",
+            x=0.5,
+            xanchor="center",
+            y=1.05,
+            yanchor="bottom",
+            bgcolor="rgba(255, 255, 255, 0)",
+            font=dict(size=14)
+        ),
+        colorway=[
+            REVELIO_PALETTE["primary"],
+            REVELIO_PALETTE["secondary"],
+            REVELIO_PALETTE["purple"],
+            REVELIO_PALETTE["gray"]
+        ]
+    )
+    
+    # Register template
+    pio.templates["revelio_min"] = revelio_template
+    pio.templates.default = "revelio_min"
+
+
+# ========== DATA LOADING ==========
+def load_metro_data(metro_key: str) -> metro_records.MetroRecords:
+    """Compile a metro's hint records from the columnar store"""
+    return metro_records.compile_metro(metro_key)
+
+
+# Compiled metro records are shared by every session and bounded by approximate
+# resident bytes rather than entry count, so a large catalog cannot grow the
+# process without limit. Records are immutable tuples and arrays, but callers
+# must not modify the arrays in place.
+METRO_CACHE_BYTES_ENV = "GTM_METRO_CACHE_BYTES"
+METRO_CACHE_TTL_ENV = "GTM_METRO_CACHE_TTL"
+METRO_CACHE = LRUCache(
+    max_entries=None,
+    max_bytes=int(os.environ.get(METRO_CACHE_BYTES_ENV, 256 * 1024 * 1024)),
+    ttl=float(os.environ.get(METRO_CACHE_TTL_ENV, 0)) or None,
+)
+
+
+def get_metro_data(metro_key: str) -> metro_records.MetroRecords:
+    """Return a metro's compiled records from the shared byte-bounded cache"""
+    return METRO_CACHE.get_or_build(metro_key, lambda: load_metro_data(metro_key))
+
+
+# ========== HINT FIGURES ==========
+@lru_cache(maxsize=4096)
+def _wrapped_spans(name: str, width: int, max_lines: int | None, style: str) -> str:
+    return "<br>".join(f"<span style='{style}'>{line}</span>" for line in wrap(name, width=width)[:max_lines])
+
+
+# Text tiers by share of total: (min share, wrap width, max lines, name style, percent style)
+SUBSECTOR_TEXT_TIERS = (
+    (0.08, 20, 2, 'font-size:88%;', 'font-size:110%; font-weight:700;'),
+    (0.05, 18, 2, 'font-size:84%;', 'font-size:105%; font-weight:700;'),
+    (0.03, 16, 1, 'font-size:82%;', 'font-size:100%; font-weight:700;'),
+    (0.015, None, 0, '', 'font-size:85%; font-weight:700;'),
+)
+SECTOR_TEXT_TIERS = (
+    (0.15, 20, None, 'font-size:150%; font-weight:800;'),
+    (0.10, 18, None, 'font-size:130%; font-weight:800;'),
+    (0.05, 15, 1, 'font-size:110%; font-weight:700;'),
+)
+
+
+def format_subsector_text(name: str, share: float) -> str:
+    """Cell text for a subsector box, sized by share (hidden under 1.5%)"""
+    for tier_share, width, max_lines, name_style, percent_style in SUBSECTOR_TEXT_TIERS:
+        if share >= tier_share:
+            percent = f"<span style='{percent_style}'>{share:.1%}</span>"
+            return f"{_wrapped_spans(name, width, max_lines, name_style)}<br>{percent}" if max_lines else percent
+    return ''
+
+
+def format_sector_text(name: str, share: float) -> str:
+    """Label for a sector box, sized by the sector's share of total"""
+    for tier_share, width, max_lines, style in SECTOR_TEXT_TIERS:
+        if share >= tier_share:
+            return _wrapped_spans(name, width, max_lines, style)
+    # Small boxes: abbreviated name
+    if share >= 0.02:
+        short_name = name.split(' ')[0] if ' ' in name else name[:12]
+        return f"<span style='font-size:95%; font-weight:700;'>{short_name}</span>"
+    return f"<span style='font-size:85%; font-weight:600;'>{name.split(' ')[0][:8]}</span>"
+
+
+def compile_treemap(industry: metro_records.IndustryRecords) -> dict:
+    """Return the treemap's node arrays (ids, labels, parents, values, text, colors)"""
+    sectors, subsectors, sector_names = industry.sectors, industry.subsectors, industry.sector_names
+    # Sector nodes aggregate their (kept) subsectors; the records carry their totals
+    sector_colors = {name: SECTOR_COLORS.get(name, REVELIO_PALETTE['gray']) for name in sector_names}
+
+    return {
+        'ids': [f"{sector}/{subsector}" for sector, subsector in zip(sectors, subsectors)] + list(sector_names),
+        'labels': list(subsectors) + list(sector_names),
+        'parents': list(sectors) + [''] * len(sector_names),
+        'values': industry.headcounts.tolist() + industry.sector_headcounts.tolist(),
+        'text': [format_subsector_text(name, share) for name, share in zip(subsectors, industry.shares)]
+                + [format_sector_text(name, share) for name, share in zip(sector_names, industry.sector_shares)],
+        'colors': [sector_colors[sector] for sector in sectors] + list(sector_colors.values()),
+    }
+
+
+def build_industry_treemap(industry: metro_records.IndustryRecords) -> go.Figure:
+    """Treemap with sector labels on larger boxes and subsectors inside"""
+    nodes = compile_treemap(industry)
+
+    fig = go.Figure(go.Treemap(
+        ids=nodes['ids'],
+        labels=nodes['labels'],
+        parents=nodes['parents'],
+        values=nodes['values'],
+        branchvalues='total',
+        text=nodes['text'],
+        texttemplate='%{text}',
+        textposition='middle center',
+        textinfo='text',
+        textfont=dict(
+            size=get_text_size('treemap', 14),
+            color='white',
+            family='Inter',
+            weight=600
+        ),
+        marker=dict(
+            colors=nodes['colors'],
+            line=dict(width=1.5, color='white'),
+            pad=dict(t=8, l=5, r=5, b=8)
+        ),
+        hovertemplate=(
+            '<b>%{label}</b><br>'
+            'Employees: %{value:,.0f}<br>'
+            'Share of total: %{percentRoot:.1%}<extra></extra>'
+        ),
+    ))
+
+    fig.update_layout(
+        height=get_chart_height('treemap', 600),
+        margin=get_margin('treemap', {'t': 26, 'l': 22, 'r': 22, 'b': 28}),
+        uniformtext=dict(
+            minsize=8,
+            mode='hide'
+        ),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+
+    return fig
+
+
+def build_sector_legend_html(industry: metro_records.IndustryRecords) -> str:
+    """Return HTML color legend for the sectors shown in the treemap"""
+    # Create legend HTML with color boxes
+    legend_items = []
+    for sector in industry.sector_names:
+        color = SECTOR_COLORS.get(sector, REVELIO_PALETTE['gray'])
+        legend_items.append(
+            f'<span style="display:inline-flex; align-items:center; margin-right:16px; margin-bottom:8px;">'
+            f'<span style="display:inline-block; width:16px; height:16px; background-color:{color}; '
+            f'border-radius:3px; margin-right:6px; border:1px solid white;"></span>'
+            f'<span style="font-size:0.85rem; color:{REVELIO_PALETTE["text"]};">{sector}</span>'
+            f'</span>'
+        )
+
+    return f'<div style="display:flex; flex-wrap:wrap; margin-top:8px;">{"".join(legend_items)}</div>'
+
+
+def build_salary_range_spread(salary: metro_records.SalaryRecords) -> go.Figure:
+    """Salary range per sector for the eight best-paid sectors"""
+    # The records hold the top 8 sectors by average salary, best-paid first
+    sectors = list(salary.sectors)
+    min_sal = salary.min_salary.tolist()
+    max_sal = salary.max_salary.tolist()
+    avg_sal = salary.avg_salary.tolist()
+    colors = [SECTOR_COLORS.get(sec, REVELIO_PALETTE['gray']) for sec in sectors]
+
+    # Three array-backed traces cover every sector: range bars, min/max ticks
+    # and the labelled average dot
+    fig = go.Figure()
+
+    # Range line: a thin horizontal bar from min to max
+    fig.add_trace(go.Bar(
+        y=sectors,
+        x=[high - low for low, high in zip(min_sal, max_sal)],
+        base=min_sal,
+        orientation='h',
+        width=0.06,
+        marker=dict(color=colors, line=dict(width=0)),
+        hoverinfo='skip'
+    ))
+
+    # Min and max markers
+    fig.add_trace(go.Scatter(
+        x=min_sal + max_sal,
+        y=sectors + sectors,
+        customdata=['Min'] * len(sectors) + ['Max'] * len(sectors),
+        mode='markers',
+        marker=dict(size=8, color=colors + colors, symbol='line-ns', line=dict(width=2, color='white')),
+        hovertemplate='<b>%{y}</b><br>%{customdata}: $%{x:,.0f}<extra></extra>'
+    ))
+
+    # Average marker (larger dot)
+    fig.add_trace(go.Scatter(
+        x=avg_sal,
+        y=sectors,
+        mode='markers+text',
+        marker=dict(size=12, color=colors, line=dict(width=2, color='white')),
+        text=[f'${avg/1000:.0f}k' for avg in avg_sal],
+        textposition='top center',
+        textfont=dict(size=get_text_size('salary', 13), color=REVELIO_PALETTE['text'], family='Inter', weight=600),
+        hovertemplate='<b>%{y}</b><br>Average: $%{x:,.0f}<extra></extra>'
+    ))
+
+    fig.update_layout(
+        height=get_chart_height('salary', 400),
+        showlegend=False,
+        xaxis_title='Salary Range',
+        yaxis_title='',
+        margin=get_margin('salary', {'t': 26, 'l': 18, 'r': 92, 'b': 30}),
+        yaxis=dict(
+            tickfont=dict(size=get_text_size('salary', 14), weight=500),
+            categoryorder='array',
+            categoryarray=sectors[::-1]  # best-paid sector on top
+        ),
+        xaxis=dict(
+            title_font=dict(size=get_text_size('salary', 14)),
+            tickfont=dict(size=get_text_size('salary', 13)),
+            tickformat='$,.0f'
+        ),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    
+    return fig
+
+
+def build_growth_area(growth: metro_records.GrowthRecords) -> go.Figure:
+    """Bar chart of net employment growth per year"""
+    fig = go.Figure()
+    net_growth = growth.net_growth.tolist()
+    colors = [REVELIO_PALETTE['secondary'] if g > 0 else REVELIO_PALETTE['accent'] for g in net_growth]
+    bar_text = [f'{x/1000:+.0f}k' for x in net_growth]
+    
+    fig.add_trace(go.Bar(
+        x=growth.years.tolist(),
+        y=net_growth,
+        marker=dict(color=colors, line=dict(color='white', width=0)),
+        text=bar_text,
+        textposition='outside',
+        cliponaxis=False,
+        textfont=dict(
+            size=get_text_size('growth_bar', 14),
+            color=REVELIO_PALETTE['text'],
+            family='Inter',
+            weight=600
+        ),
+        hovertemplate='<b>%{x}</b><br>%{y:,.0f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        height=get_chart_height('growth_bar', 320),
+        showlegend=False,
+        margin=get_margin('growth_bar', {'t': 26, 'l': 22, 'r': 16, 'b': 30}),
+        xaxis=dict(
+            title='Year',
+            title_font=dict(size=get_text_size('growth_bar', 14)),
+            tickfont=dict(size=get_text_size('growth_bar', 14))
+        ),
+        yaxis=dict(
+            title='Net Growth',
+            title_font=dict(size=get_text_size('growth_bar', 14)),
+            tickfont=dict(size=get_text_size('growth_bar', 14))
+        ),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    
+    return fig
+
+
+GAUGE_COLUMNS = 2
+GAUGE_COLUMN_GAP = 0.08  # fraction of the figure width between gauge columns
+
+
+def gauge_color(percentile: float) -> str:
+    """Green if high, blue if medium, purple if low"""
+    if percentile >= 65:
+        return REVELIO_PALETTE['secondary']
+    if percentile >= 45:
+        return REVELIO_PALETTE['primary']
+    return REVELIO_PALETTE['purple']
+
+
+def gauge_grid(count: int, row_height: int, margin: dict, columns: int = GAUGE_COLUMNS):
+    """Return (figure height, indicator domains) for count gauges in a grid
+
+    Each row keeps the height a standalone gauge figure had, and rows are
+    separated by the top + bottom margin so every title has the same room.
+    """
+    rows = max(math.ceil(count / columns), 1)
+    row_gap = margin['t'] + margin['b']
+    cell_height = row_height - row_gap
+    plot_height = rows * cell_height + (rows - 1) * row_gap
+    cell_width = (1 - GAUGE_COLUMN_GAP * (columns - 1)) / columns
+
+    domains = []
+    for index in range(count):
+        row, column = divmod(index, columns)
+        top = 1 - row * (cell_height + row_gap) / plot_height
+        x0 = column * (cell_width + GAUGE_COLUMN_GAP)
+        domains.append({
+            'x': [round(x0, 4), round(x0 + cell_width, 4)],
+            'y': [round(max(top - cell_height / plot_height, 0), 4), round(top, 4)],
+        })
+    return plot_height + row_gap, domains
+
+
+def build_metro_comparison(metro_key: str) -> go.Figure:
+    """Percentile gauges comparing a metro against other U.S. metros, in one figure"""
+    import percentile_engine  # imported lazily: it needs pandas, and the gauges are usually pre-rendered
+
+    percentile_data = percentile_engine.get_percentile_table().metro_ranks(metro_key)
+    margin = get_margin('percentiles', {'l': 16, 'r': 16, 't': 50, 'b': 20})
+    height, domains = gauge_grid(len(percentile_data), get_chart_height('percentiles', 240), margin)
+
+    fig = go.Figure()
+    for (metric, percentile), domain in zip(percentile_data.items(), domains):
+        fig.add_trace(go.Indicator(
+            mode="gauge+number",
+            value=percentile,
+            domain=domain,
+            title={
+                'text': f"<b>{metric}</b>",
+                'font': {'size': get_text_size('percentiles', 20), 'color': REVELIO_PALETTE['text'], 'family': 'Inter'}
+            },
+            gauge={
+                'axis': {
+                    'range': [0, 100],
+                    'tickwidth': 1,
+                    'tickcolor': REVELIO_PALETTE['light_gray'],
+                    'tickfont': {'size': get_text_size('percentiles', 11)}
+                },
+                'bar': {'color': gauge_color(percentile), 'thickness': 0.75},
+                'bgcolor': "white",
+                'borderwidth': 1,
+                'bordercolor': REVELIO_PALETTE['grid'],
+                'steps': [
+                    {'range': [0, 50], 'color': '#F8FAFC'},
+                    {'range': [50, 100], 'color': '#E2E8F0'}
+                ],
+                'threshold': {
+                    'line': {'color': REVELIO_PALETTE['light_gray'], 'width': 2},
+                    'thickness': 0.75,
+                    'value': 50
+                }
+            },
+            number={
+                'suffix': get_percentile_suffix(percentile),
+                'font': {'size': get_text_size('percentiles', 32), 'color': REVELIO_PALETTE['text'], 'family': 'Inter', 'weight': 700}
+            }
+        ))
+
+    fig.update_layout(
+        height=height,
+        margin=margin,
+        paper_bgcolor='white'
+    )
+    return fig
+
+
+def build_top_employers_bars(employers: metro_records.EmployerRecords) -> go.Figure:
+    """Top three college and non-college employers on a single bar chart"""
+    # The records hold both top threes, combined and sorted by headcount
+    headcounts = employers.headcounts.tolist()
+
+    # Create color map
+    colors = [REVELIO_PALETTE['purple'] if cat == metro_records.NONCOLLEGE_CATEGORY else REVELIO_PALETTE['secondary']
+              for cat in employers.categories]
+    
+    # Create single bar chart
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        y=list(employers.companies),
+        x=headcounts,
+        orientation='h',
+        marker=dict(color=colors, line=dict(color='white', width=0)),
+        text=[f'{x//1000}k' if x >= 1000 else str(x) for x in headcounts],
+        textposition='outside',
+        cliponaxis=False,
+        textfont=dict(size=get_text_size('employers', 13), color=REVELIO_PALETTE['text'], family='Inter', weight=600),
+        hovertemplate='<b>%{y}</b><br>%{customdata}<br>Employees: %{x:,.0f}<extra></extra>',
+        customdata=list(employers.categories),
+        showlegend=False
+    ))
+    
+    # Add manual legend using annotations
+    fig.add_annotation(
+        x=0.02, y=1.1,
+        xref='paper', yref='paper',
+        text=f'<span style="font-size:18px;font-weight:600;color:{REVELIO_PALETTE["purple"]};">● Non-College Grads</span>'
+             f'&nbsp;&nbsp;&nbsp;'
+             f'<span style="font-size:18px;font-weight:600;color:{REVELIO_PALETTE["secondary"]};">● College Grads</span>',
+        showarrow=False,
+        xanchor='left',
+        font=dict(size=18, family='Inter')
+    )
+    
+    fig.update_layout(
+        height=get_chart_height('employers', 420),
+        showlegend=False,
+        xaxis_title='Employee Count',
+        yaxis_title='',
+        margin=get_margin('employers', {'t': 70, 'l': 18, 'r': 100, 'b': 36}),
+        yaxis=dict(tickfont=dict(size=get_text_size('employers', 12), weight=500)),
+        xaxis=dict(
+            title_font=dict(size=get_text_size('employers', 13)),
+            tickfont=dict(size=get_text_size('employers', 12))
+        ),
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    
+    return fig
+
+
+# ========== HUD ==========
+def build_score_bar(score: int, max_score: int) -> go.Figure:
+    """Render a compact stacked score bar showing achieved vs remaining points"""
+    max_score = max(max_score, 1)
+    clamped_score = max(0, min(score, max_score))
+    remainder = max(max_score - clamped_score, 0)
+    cfg = CHART_CONFIG.get('hud_score', {})
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=[clamped_score],
+        y=['score'],
+        orientation='h',
+        marker=dict(color=REVELIO_PALETTE["secondary"]),
+        hovertemplate='Score: %{x:,.0f}<extra></extra>',
+        showlegend=False
+    ))
+    
+    fig.add_trace(go.Bar(
+        x=[remainder],
+        y=['score'],
+        orientation='h',
+        marker=dict(color=REVELIO_PALETTE["grid"]),
+        hovertemplate='Remaining: %{x:,.0f}<extra></extra>',
+        showlegend=False
+    ))
+    
+    fig.update_traces(marker_line=dict(width=0))
+    fig.update_layout(
+        barmode='stack',
+        height=cfg.get('height', 44),
+        margin=cfg.get('margin', {'t': 6, 'b': 6, 'l': 6, 'r': 6}),
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        showlegend=False,
+        xaxis=dict(range=[0, max_score], visible=False, fixedrange=True),
+        yaxis=dict(visible=False, fixedrange=True)
+    )
+    
+    label_size = max(11, int(round(13 * cfg.get('text', 1))))
+    fig.add_annotation(
+        x=0,
+        y='score',
+        xanchor='left',
+        yanchor='middle',
+        text=f"Score: {clamped_score:,}",
+        font=dict(size=label_size, color=REVELIO_PALETTE["text"], family='Inter'),
+        showarrow=False
+    )
+    
+    return fig
+
+
+# Figure builders for each hint, keyed by the hint's 'key' in app.HINTS
+HINT_FIGURE_BUILDERS = {
+    'industry': lambda records: [build_industry_treemap(records.industry)],
+    'salary': lambda records: [build_salary_range_spread(records.salary)],
+    'growth': lambda records: [build_growth_area(records.growth)],
+    'comparison': lambda records: [build_metro_comparison(records.metro_key)],
+    'employers': lambda records: [build_top_employers_bars(records.employers)],
+}
+
+# Hints whose figures depend on every metro's data, not just the mystery metro's
+CROSS_METRO_HINTS = frozenset({'comparison'})
+
+
+def build_hint(metro_key: str, hint_key: str) -> list[go.Figure]:
+    """Build the figures for one hint of a metro"""
+    return HINT_FIGURE_BUILDERS[hint_key](get_metro_data(metro_key))
+
+
+def build_hint_figures(metro_key: str) -> dict[str, list[go.Figure]]:
+    """Build every hint figure for a metro, keyed by hint"""
+    records = get_metro_data(metro_key)
+    return {hint_key: builder(records) for hint_key, builder in HINT_FIGURE_BUILDERS.items()}
+
+
+# ========== FIGURE CACHE ==========
+# Figures depend only on the metro and the constants below, so one process-wide
+# cache serves every session. Entries hold validated go.Figure objects:
+# st.plotly_chart would rebuild a Figure from a JSON dict on every rerun.
+FIGURE_CACHE_ENTRIES_ENV = "GTM_FIGURE_CACHE_ENTRIES"
+
+
+def chart_config_hash() -> str:
+    """Return a short hash of every constant that shapes the hint figures"""
+    config = {
+        'chart_config': CHART_CONFIG,
+        'height_scale': CHART_HEIGHT_SCALE,
+        'text_scale': CHART_TEXT_SCALE,
+        'palette': REVELIO_PALETTE,
+        'sector_colors': SECTOR_COLORS,
+    }
+    payload = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+CONFIG_HASH = chart_config_hash()
+# By default room for every metro's hints, so warm-up never evicts its own figures
+FIGURE_CACHE_ENTRIES = int(os.environ.get(FIGURE_CACHE_ENTRIES_ENV)
+                           or max(256, len(METROS) * len(HINT_FIGURE_BUILDERS)))
+FIGURE_CACHE = LRUCache(max_entries=FIGURE_CACHE_ENTRIES)
+
+
+def figure_cache_key(metro_key: str, hint_key: str) -> tuple[str, str, str]:
+    """Cache key for a hint's figures under the current chart configuration"""
+    return (metro_key, hint_key, CONFIG_HASH)
+
+
+def load_or_build_hint(metro_key: str, hint_key: str) -> list[go.Figure]:
+    """Load a hint's pre-rendered asset if it is current, otherwise build it"""
+    import hint_assets  # imported lazily: hint_assets builds on this module
+
+    figures = hint_assets.load_hint_figures(metro_key, hint_key)
+    if figures is None:
+        figures = build_hint(metro_key, hint_key)
+    return figures
+
+
+def get_hint_figures(metro_key: str, hint_key: str) -> list[go.Figure]:
+    """Return a hint's figures from the shared cache, filling a miss from disk or a build"""
+    return FIGURE_CACHE.get_or_build(
+        figure_cache_key(metro_key, hint_key),
+        lambda: load_or_build_hint(metro_key, hint_key),
+    )
+
+
+def get_sector_legend_html(metro_key: str) -> str:
+    """Return the treemap's sector legend from the shared cache"""
+    return FIGURE_CACHE.get_or_build(
+        figure_cache_key(metro_key, 'industry:legend'),
+        lambda: build_sector_legend_html(get_metro_data(metro_key).industry),
+    )
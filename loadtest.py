@@ -0,0 +1,463 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Drives N simulated players through Streamlit's ``AppTest`` in parallel
+threads (intro -> search and wrong guesses -> win or lose -> Play Again) and reports
+latency percentiles per interaction, CPU time per rerun, memory growth and
+a per-step breakdown from the app's ``perf`` spans. ``--idle-sessions``
+instead measures what each idle session costs in memory, to size containers,
+and ``--race`` puts N players in one race room and delivers every rerun the
+race hub pushes, counting reruns per event::
+
+    python loadtest.py --sessions 20 --games 3
+    python loadtest.py --idle-sessions 200
+    python loadtest.py --race 8
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from streamlit.runtime import Runtime
+from streamlit.testing.v1 import app_test
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.util import patch_config_options
+
+import perf
+import race_hub
+from game_config import ALL_METRO_NAMES, METROS
+import memory_report
+from memory_report import CACHES, current_rss_bytes, memory_limit_bytes
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+INTRO_BUTTON = "Got it — Let's Play!"
+SUBMIT_BUTTON = "Submit Guess"
+PLAY_AGAIN_BUTTON = "Play Again"
+START_RACE_BUTTON = "Start a race room"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class Recorder:
+    """Thread-safe collection of per-interaction latencies."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = []
+
+    def add(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies[step].append(seconds)
+
+    def error(self, message: str) -> None:
+        with self._lock:
+            self.errors.append(message)
+
+
+@contextmanager
+def shared_runtime():
+    """Serve every AppTest session from one mock Runtime, config and script cache.
+
+    AppTest installs a fresh mock as the global ``Runtime._instance`` and sets
+    the global ``global.appTest`` option for each run, restoring both when the
+    run ends, so concurrent sessions tear them out from under each other.
+    Pinning them for the whole test fixes that; the shared runtime also gives
+    every session the same st.cache_data storage, and sharing one ScriptCache
+    compiles app.py once (``ast.parse`` is not thread-safe on Python 3.11),
+    both as a real server would.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    script_cache = ScriptCache()
+    get_bytecode = ScriptCache.get_bytecode
+    with patch.object(Runtime, "instance", classmethod(lambda cls: runtime)), \
+            patch.object(Runtime, "exists", classmethod(lambda cls: True)), \
+            patch.object(ScriptCache, "get_bytecode", lambda self, path: get_bytecode(script_cache, path)), \
+            patch_config_options({"global.appTest": True}), \
+            patch.object(app_test, "patch_config_options", lambda options: nullcontext()):
+        yield runtime
+
+
+def _button(at: AppTest, label: str):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"No button labelled {label!r}")
+
+
+def _run(at: AppTest, recorder: Recorder, step: str) -> None:
+    started = time.perf_counter()
+    at.run()
+    recorder.add(step, time.perf_counter() - started)
+    if at.exception:
+        recorder.error(f"{step}: {at.exception[0].message}")
+
+
+def _pick(at: AppTest, recorder: Recorder, rng: random.Random, name: str) -> None:
+    """Type part of a metro name into the search box and pick it from the matches."""
+    at.text_input[0].input(name[:rng.randint(3, len(name))])
+    _run(at, recorder, "search")
+    if not at.radio or name not in at.radio[0].options:
+        at.text_input[0].input(name)
+        _run(at, recorder, "search")
+    at.radio[0].set_value(name)
+
+
+def play_session(session_id: int, games: int, seed: int, timeout: float, recorder: Recorder) -> None:
+    """Play one simulated player's session start to finish."""
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    _run(at, recorder, "intro")
+    _button(at, INTRO_BUTTON).click()
+    _run(at, recorder, "intro")
+
+    for game in range(games):
+        answer = METROS[at.session_state["game"].game.mystery_metro]['name']
+        wrong_guesses = rng.randint(0, 5)
+        for _ in range(wrong_guesses):
+            _pick(at, recorder, rng, rng.choice([name for name in ALL_METRO_NAMES if name != answer]))
+            _button(at, SUBMIT_BUTTON).click()
+            _run(at, recorder, "guess_lose" if at.session_state["game"].game.game_over else "guess_wrong")
+        if not at.session_state["game"].game.game_over:
+            _pick(at, recorder, rng, answer)
+            _button(at, SUBMIT_BUTTON).click()
+            _run(at, recorder, "guess_win")
+        if game < games - 1:
+            _button(at, PLAY_AGAIN_BUTTON).click()
+            _run(at, recorder, "play_again")
+
+
+def run_load_test(sessions: int, games: int, seed: int = 0, timeout: float = 60.0,
+                  trace_memory: bool = False) -> dict:
+    """Run every session concurrently and return the report as a dict."""
+    # One throwaway run warms the process (imports, data store, figure cache)
+    AppTest.from_file(str(APP_PATH), default_timeout=timeout).run()
+    perf.reset()
+
+    recorder = Recorder()
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = current_rss_bytes()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    with shared_runtime(), ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [
+            pool.submit(play_session, session_id, games, seed, timeout, recorder)
+            for session_id in range(sessions)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as exc:
+                recorder.error(f"session failed: {exc!r}")
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+    rss_after = current_rss_bytes()
+    traced = None
+    if trace_memory:
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        traced = {'current_bytes': traced_current, 'peak_bytes': traced_peak}
+
+    all_latencies = [value for samples in recorder.latencies.values() for value in samples]
+    reruns = len(all_latencies)
+    report = {
+        'sessions': sessions,
+        'games_per_session': games,
+        'wall_seconds': wall,
+        'reruns': reruns,
+        'reruns_per_second': reruns / wall if wall else 0.0,
+        'cpu_seconds_per_rerun': cpu / reruns if reruns else 0.0,
+        'rss_growth_bytes': rss_after - rss_before,
+        'tracemalloc': traced,
+        'errors': recorder.errors,
+        'interactions': {
+            step: _summarise(samples) for step, samples in sorted(recorder.latencies.items())
+        },
+        'steps': {
+            name: {
+                **_summarise([wall_s for wall_s, _ in samples]),
+                'cpu_mean': statistics.fmean(cpu_s for _, cpu_s in samples),
+            }
+            for name, samples in sorted(perf.snapshot().items())
+        },
+    }
+    report['interactions']['all'] = _summarise(all_latencies)
+    report['reruns_by_cause'] = perf.rerun_totals()
+    report['caches'] = {name: cache.stats() for name, cache in CACHES.items()}
+    return report
+
+
+def measure_idle_sessions(count: int, timeout: float = 60.0) -> dict:
+    """Open sessions that load the app once and then sit idle; return what each one costs.
+
+    tracemalloc counts every Python allocation a session keeps (Streamlit's
+    session and widget state as well as the app's), which a sizeof walk of
+    the app's own state cannot see.
+    """
+    AppTest.from_file(str(APP_PATH), default_timeout=timeout).run()
+    errors = []
+    gc.collect()
+    rss_before = current_rss_bytes()
+    tracemalloc.start()
+    with shared_runtime():
+        idle = []
+        for _ in range(count):
+            at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+            at.run()
+            if at.exception:
+                errors.append(at.exception[0].message)
+            idle.append(at)
+        gc.collect()
+        traced_bytes = tracemalloc.get_traced_memory()[0]
+        rss_after = current_rss_bytes()
+        game_state_bytes = statistics.fmean(memory_report.session_sizes())
+    tracemalloc.stop()
+    session_bytes = traced_bytes / count
+    limit = memory_limit_bytes()
+    return {
+        'idle_sessions': count,
+        'traced_bytes_per_session': session_bytes,
+        'rss_bytes_per_session': (rss_after - rss_before) / count,
+        'game_state_bytes_per_session': game_state_bytes,
+        'rss_bytes': rss_after,
+        'limit_bytes': limit,
+        'idle_session_capacity': memory_report.idle_session_capacity(rss_after, limit, session_bytes),
+        'errors': errors,
+    }
+
+
+def format_idle_report(report: dict) -> str:
+    lines = [
+        f"{report['idle_sessions']} idle sessions: {report['traced_bytes_per_session'] / 1e3:.1f} KB each "
+        f"(tracemalloc), RSS {report['rss_bytes_per_session'] / 1e3:+.1f} KB each, "
+        f"game state {report['game_state_bytes_per_session']:.0f} bytes each",
+    ]
+    if report['limit_bytes']:
+        lines.append(
+            f"Memory limit {report['limit_bytes'] / 1e9:.2f} GB, RSS now {report['rss_bytes'] / 1e6:.0f} MB: "
+            f"room for ~{report['idle_session_capacity']:,} more idle sessions"
+        )
+    lines.append(f"Set {memory_report.IDLE_SESSION_BYTES_ENV}={report['traced_bytes_per_session']:.0f} "
+                 "for the admin view's estimate")
+    if report['errors']:
+        lines.append(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+    return "\n".join(lines)
+
+
+def run_race(players: int, seed: int = 0, timeout: float = 60.0) -> dict:
+    """Race players through one room, taking turns to guess, and return the fan-out report.
+
+    AppTest sessions have no browser connection for the hub to wake, so the
+    hub's wake-up is stubbed to succeed and the test delivers each pushed
+    rerun itself, by running every session the hub marked pending.
+    """
+    AppTest.from_file(str(APP_PATH), default_timeout=timeout).run()
+    perf.reset()
+    rng = random.Random(seed)
+    recorder = Recorder()
+    hub = race_hub.get_hub()
+    pushed = 0
+
+    def deliver(sessions: list[AppTest], code: str) -> None:
+        nonlocal pushed
+        pending = hub.pending_players(code)
+        for at in sessions:
+            if at.session_state["game"].race[1] in pending:
+                _run(at, recorder, "race_push")
+                pushed += 1
+
+    figures_before = CACHES['figures'].stats()
+    with shared_runtime(), patch.object(race_hub, "rerun_session", lambda session_id: True):
+        host = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        _run(host, recorder, "intro")
+        _button(host, INTRO_BUTTON).click()
+        _run(host, recorder, "intro")
+        _button(host, START_RACE_BUTTON).click()
+        _run(host, recorder, "race_join")
+        code = host.session_state["game"].race[0]
+        events_before = hub.stats()['events']
+        sessions = [host]
+        for _ in range(players - 1):
+            at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+            at.query_params["race"] = code
+            _run(at, recorder, "race_join")
+            _button(at, INTRO_BUTTON).click()
+            _run(at, recorder, "intro")
+            sessions.append(at)
+            deliver(sessions, code)
+
+        answer = METROS[host.session_state["game"].game.mystery_metro]['name']
+        wrong_left = [rng.randint(0, 5) for _ in sessions]
+        # Players take turns, one guess each, until everyone has finished
+        while not all(at.session_state["game"].game.game_over for at in sessions):
+            for index, at in enumerate(sessions):
+                if at.session_state["game"].game.game_over:
+                    continue
+                if wrong_left[index]:
+                    wrong_left[index] -= 1
+                    _pick(at, recorder, rng, rng.choice([name for name in ALL_METRO_NAMES if name != answer]))
+                else:
+                    _pick(at, recorder, rng, answer)
+                _button(at, SUBMIT_BUTTON).click()
+                _run(at, recorder, "race_guess")
+                deliver(sessions, code)
+        events = hub.stats()['events'] - events_before
+        standings = hub.standings(code, host.session_state["game"].race[1])
+
+    figures_after = CACHES['figures'].stats()
+    figure_lookups = (figures_after['hits'] + figures_after['misses']
+                      - figures_before['hits'] - figures_before['misses'])
+    return {
+        'players': players,
+        'events': events,
+        'pushed_reruns': pushed,
+        'reruns_per_player_per_event': pushed / (events * (players - 1)) if events and players > 1 else 0.0,
+        'finished': sum(row.finished for row in standings),
+        'winners': sum(row.won for row in standings),
+        'figure_lookups': figure_lookups,
+        'figure_hit_ratio': ((figures_after['hits'] - figures_before['hits']) / figure_lookups
+                             if figure_lookups else 0.0),
+        'interactions': {
+            step: _summarise(samples) for step, samples in sorted(recorder.latencies.items())
+        },
+        'reruns_by_cause': perf.rerun_totals(),
+        'errors': recorder.errors,
+    }
+
+
+def format_race_report(report: dict) -> str:
+    lines = [
+        f"{report['players']} players in one race room: {report['events']} events pushed "
+        f"{report['pushed_reruns']} reruns ({report['reruns_per_player_per_event']:.2f} per other player "
+        f"per event); {report['finished']} finished, {report['winners']} solved",
+        f"Hint figures: {report['figure_lookups']} lookups, {report['figure_hit_ratio']:.1%} from the shared cache",
+        "",
+        f"{'Rerun latency by interaction':<32}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}",
+    ]
+    for name, row in report['interactions'].items():
+        lines.append(f"  {name:<30}{row['count']:>7}{row['p50'] * 1000:>9.1f}"
+                     f"{row['p95'] * 1000:>9.1f}{row['p99'] * 1000:>9.1f}")
+    lines.append("")
+    lines.append(f"{'Reruns by cause':<32}{'count':>7}{'mean':>9}{'cpu':>9}")
+    for cause, row in report['reruns_by_cause'].items():
+        lines.append(f"  {cause:<30}{row['count']:>7}{row['seconds'] / row['count'] * 1000:>9.1f}"
+                     f"{row['cpu_seconds'] / row['count'] * 1000:>9.1f}")
+    if report['errors']:
+        lines.append("")
+        lines.append(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+    return "\n".join(lines)
+
+
+def _summarise(samples: list[float]) -> dict:
+    return {
+        'count': len(samples),
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+        'mean': statistics.fmean(samples) if samples else 0.0,
+    }
+
+
+def format_report(report: dict) -> str:
+    """Render the report as plain-text tables (times in milliseconds)."""
+    lines = [
+        f"{report['sessions']} sessions x {report['games_per_session']} games: "
+        f"{report['reruns']} reruns in {report['wall_seconds']:.1f}s "
+        f"({report['reruns_per_second']:.1f}/s)",
+        f"CPU per rerun: {report['cpu_seconds_per_rerun'] * 1000:.1f} ms   "
+        f"RSS growth: {report['rss_growth_bytes'] / 1e6:+.1f} MB",
+    ]
+    if report['tracemalloc']:
+        lines.append(
+            f"tracemalloc: {report['tracemalloc']['current_bytes'] / 1e6:.1f} MB retained, "
+            f"{report['tracemalloc']['peak_bytes'] / 1e6:.1f} MB peak"
+        )
+    for title, rows, extra in (("Rerun latency by interaction", report['interactions'], False),
+                               ("Time by step", report['steps'], True)):
+        lines.append("")
+        header = f"{title:<32}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}"
+        lines.append(header + (f"{'cpu':>9}" if extra else ""))
+        for name, row in rows.items():
+            line = (f"  {name:<30}{row['count']:>7}{row['p50'] * 1000:>9.1f}"
+                    f"{row['p95'] * 1000:>9.1f}{row['p99'] * 1000:>9.1f}")
+            if extra:
+                line += f"{row['cpu_mean'] * 1000:>9.1f}"
+            lines.append(line)
+    lines.append("")
+    lines.append(f"{'Reruns by cause':<32}{'count':>7}{'mean':>9}{'cpu':>9}")
+    for cause, row in report['reruns_by_cause'].items():
+        lines.append(f"  {cause:<30}{row['count']:>7}{row['seconds'] / row['count'] * 1000:>9.1f}"
+                     f"{row['cpu_seconds'] / row['count'] * 1000:>9.1f}")
+    lines.append("")
+    lines.append(f"{'Cache':<32}{'entries':>9}{'resident':>11}{'hit ratio':>11}{'evictions':>11}")
+    for name, stats in report['caches'].items():
+        lines.append(f"  {name:<30}{stats['entries']:>9}{stats['resident_bytes'] / 1e3:>9.1f}KB"
+                     f"{stats['hit_ratio']:>11.1%}{stats['evictions']:>11}")
+    if report['errors']:
+        lines.append("")
+        lines.append(f"{len(report['errors'])} errors, first: {report['errors'][0]}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the app with concurrent AppTest sessions")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent players")
+    parser.add_argument("--games", type=int, default=2, help="games per player")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per rerun")
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace Python allocations")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--daily", action="store_true", help="start every session on the daily puzzle")
+    parser.add_argument("--idle-sessions", type=int, default=0,
+                        help="instead of playing, measure the memory cost of this many idle sessions")
+    parser.add_argument("--race", type=int, default=0, metavar="PLAYERS",
+                        help="instead, race this many players in one room and count pushed reruns")
+    args = parser.parse_args(argv)
+
+    # Keep simulated plays out of the real score store
+    scratch = tempfile.TemporaryDirectory()
+    os.environ.setdefault("GTM_SCORE_DB", str(Path(scratch.name) / "scores.sqlite3"))
+    if args.daily:
+        os.environ["GTM_PUZZLE_MODE"] = "daily"
+    if args.idle_sessions:
+        report = measure_idle_sessions(args.idle_sessions, args.timeout)
+        print(json.dumps(report, indent=2) if args.json else format_idle_report(report))
+        return 1 if report['errors'] else 0
+    if args.race:
+        report = run_race(args.race, args.seed, args.timeout)
+        print(json.dumps(report, indent=2) if args.json else format_race_report(report))
+        return 1 if report['errors'] else 0
+    report = run_load_test(args.sessions, args.games, args.seed, args.timeout, args.tracemalloc)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
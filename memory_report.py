@@ -0,0 +1,122 @@
+"""Memory accounting for sessions and shared caches.
+
+Sizes each live session's state (``game_session.live_sessions``) and every
+entry of the shared caches with a ``deep_sizeof`` walk, next to the process
+RSS and the container's memory limit (cgroup v2 or v1, or
+``GTM_MEMORY_LIMIT_BYTES``), and estimates how many more idle sessions fit
+under that limit.
+
+A session also costs Streamlit's own per-session objects, which a walk of
+the app's state cannot see. ``python loadtest.py --idle-sessions 200``
+measures the whole cost with tracemalloc; set ``GTM_IDLE_SESSION_BYTES`` to
+its figure and the estimate uses it. The app shows this report at
+``?admin=<token>`` when ``GTM_ADMIN_TOKEN`` is set.
+"""
+import hmac
+import os
+import resource
+import statistics
+import sys
+from pathlib import Path
+
+import game_session
+import hint_figures
+import score_distribution
+from caching import deep_sizeof
+
+ADMIN_TOKEN_ENV = "GTM_ADMIN_TOKEN"
+LIMIT_ENV = "GTM_MEMORY_LIMIT_BYTES"
+IDLE_SESSION_BYTES_ENV = "GTM_IDLE_SESSION_BYTES"
+CGROUP_LIMIT_FILES = (
+    Path("/sys/fs/cgroup/memory.max"),                    # cgroup v2
+    Path("/sys/fs/cgroup/memory/memory.limit_in_bytes"),  # cgroup v1
+)
+# cgroup v1 reports "no limit" as a huge page-aligned number
+UNLIMITED_BYTES = 1 << 60
+MAX_ENTRIES_LISTED = 20
+
+CACHES = {
+    'metro_data': hint_figures.METRO_CACHE,
+    'figures': hint_figures.FIGURE_CACHE,
+    'histograms': score_distribution.HISTOGRAM_CACHE,
+}
+
+
+def admin_allowed(token: str | None) -> bool:
+    """True if token matches GTM_ADMIN_TOKEN (the view is off when it is unset)."""
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    return bool(expected and token) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_limit_bytes() -> int | None:
+    """The container's memory limit, falling back to physical memory (None if unknown)."""
+    if os.environ.get(LIMIT_ENV):
+        return int(os.environ[LIMIT_ENV])
+    for path in CGROUP_LIMIT_FILES:
+        try:
+            value = path.read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < UNLIMITED_BYTES:
+            return int(value)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def session_sizes() -> list[int]:
+    """Approximate bytes of each live session's state."""
+    return [deep_sizeof(session) for session in game_session.live_sessions()]
+
+
+def cache_entry_sizes() -> dict[str, list[tuple]]:
+    """Return {cache name: [(key, bytes), ...] largest first} for the shared caches."""
+    return {name: cache.entry_sizes() for name, cache in CACHES.items()}
+
+
+def idle_session_capacity(rss: int, limit: int | None, session_bytes: float) -> int | None:
+    """How many more sessions of session_bytes fit between rss and the limit."""
+    if not limit or session_bytes <= 0:
+        return None
+    return max(int((limit - rss) // session_bytes), 0)
+
+
+def memory_report() -> dict:
+    """Sessions, cache entries, RSS and headroom for the admin view."""
+    sizes = session_sizes()
+    rss = current_rss_bytes()
+    limit = memory_limit_bytes()
+    # The app's state alone is a tiny part of a session; only estimate from a measured cost
+    idle_bytes = float(os.environ.get(IDLE_SESSION_BYTES_ENV) or 0)
+    return {
+        'rss_bytes': rss,
+        'limit_bytes': limit,
+        'sessions': len(sizes),
+        'session_bytes_mean': statistics.fmean(sizes) if sizes else 0.0,
+        'session_bytes_max': max(sizes, default=0),
+        'session_bytes_total': sum(sizes),
+        'idle_session_bytes': idle_bytes,
+        'idle_session_capacity': idle_session_capacity(rss, limit, idle_bytes),
+        'caches': {
+            name: {
+                'entries': len(entries),
+                'total_bytes': sum(size for _, size in entries),
+                'largest': [(repr(key), size) for key, size in entries[:MAX_ENTRIES_LISTED]],
+            }
+            for name, entries in cache_entry_sizes().items()
+        },
+    }
@@ -0,0 +1,143 @@
+"""Compact per-metro records behind the hint figures.
+
+Each metro's rows are compiled once, straight from the Arrow store, into
+small immutable records that are already filtered, sorted and cut to what
+the hints show: treemap subsectors with at least 1% of employment and their
+sector totals, the eight best-paid sectors, net growth per year and the
+three largest employers of each kind. Numbers are ``array.array`` columns
+and labels are tuples, so a hint builder iterates a few dozen values
+directly; for tables of 3-60 rows, pandas' per-call overhead costs more than
+the work itself::
+
+    python metro_records.py Memphis
+"""
+import sys
+from array import array
+from typing import NamedTuple
+
+import metro_store
+from caching import deep_sizeof
+
+# Treemap subsectors below this share of total employment are dropped
+MIN_SUBSECTOR_SHARE = 0.01
+TOP_SALARY_SECTORS = 8
+TOP_EMPLOYERS = 3
+NONCOLLEGE_CATEGORY = 'Non-College Grads'
+COLLEGE_CATEGORY = 'College Grads'
+
+
+class IndustryRecords(NamedTuple):
+    """Kept treemap subsectors in source order, plus their sectors sorted by name."""
+    sectors: tuple[str, ...]
+    subsectors: tuple[str, ...]
+    headcounts: array            # 'q'
+    shares: array                # 'd', share of the metro's total employment
+    sector_names: tuple[str, ...]
+    sector_headcounts: array     # 'q', summed over kept subsectors
+    sector_shares: array         # 'd'
+
+
+class SalaryRecords(NamedTuple):
+    """Best-paid sectors, highest average salary first."""
+    sectors: tuple[str, ...]
+    min_salary: array            # 'q'
+    max_salary: array            # 'q'
+    avg_salary: array            # 'q'
+
+
+class GrowthRecords(NamedTuple):
+    years: array                 # 'q'
+    net_growth: array            # 'q'
+
+
+class EmployerRecords(NamedTuple):
+    """Largest employers of both kinds, smallest headcount first (bar order)."""
+    companies: tuple[str, ...]
+    headcounts: array            # 'q'
+    categories: tuple[str, ...]
+
+
+class MetroRecords(NamedTuple):
+    metro_key: str
+    industry: IndustryRecords
+    salary: SalaryRecords
+    growth: GrowthRecords
+    employers: EmployerRecords
+
+
+def compile_industry(sectors: list, subsectors: list, headcounts: list) -> IndustryRecords:
+    """Drop subsectors under 1% of total employment and total the rest per sector."""
+    total = sum(headcounts)
+    kept = [row for row in zip(sectors, subsectors, headcounts) if row[2] >= total * MIN_SUBSECTOR_SHARE]
+    shares = array('d', (headcount / total for _, _, headcount in kept))
+    sector_names = tuple(sorted({sector for sector, _, _ in kept}))
+    position = {name: index for index, name in enumerate(sector_names)}
+    sector_headcounts = array('q', [0]) * len(sector_names)
+    sector_shares = array('d', [0.0]) * len(sector_names)
+    for (sector, _, headcount), share in zip(kept, shares):
+        sector_headcounts[position[sector]] += headcount
+        sector_shares[position[sector]] += share
+    return IndustryRecords(
+        sectors=tuple(sector for sector, _, _ in kept),
+        subsectors=tuple(subsector for _, subsector, _ in kept),
+        headcounts=array('q', (headcount for _, _, headcount in kept)),
+        shares=shares,
+        sector_names=sector_names,
+        sector_headcounts=sector_headcounts,
+        sector_shares=sector_shares,
+    )
+
+
+def compile_salary(sectors: list, min_salary: list, max_salary: list, avg_salary: list) -> SalaryRecords:
+    """Keep the best-paid sectors by average salary (ties in source order)."""
+    top = sorted(range(len(sectors)), key=lambda row: -avg_salary[row])[:TOP_SALARY_SECTORS]
+    return SalaryRecords(
+        sectors=tuple(sectors[row] for row in top),
+        min_salary=array('q', (min_salary[row] for row in top)),
+        max_salary=array('q', (max_salary[row] for row in top)),
+        avg_salary=array('q', (avg_salary[row] for row in top)),
+    )
+
+
+def compile_employers(noncollege: tuple[list, list], college: tuple[list, list]) -> EmployerRecords:
+    """Top employers of each kind from (companies, headcounts) columns, smallest first."""
+    rows = []
+    for category, (companies, headcounts) in ((NONCOLLEGE_CATEGORY, noncollege), (COLLEGE_CATEGORY, college)):
+        top = sorted(range(len(companies)), key=lambda row: -headcounts[row])[:TOP_EMPLOYERS]
+        rows += [(companies[row], headcounts[row], category) for row in top]
+    rows.sort(key=lambda row: row[1])
+    return EmployerRecords(
+        companies=tuple(company for company, _, _ in rows),
+        headcounts=array('q', (headcount for _, headcount, _ in rows)),
+        categories=tuple(category for _, _, category in rows),
+    )
+
+
+def compile_metro(metro_key: str, store: metro_store.MetroStore | None = None) -> MetroRecords:
+    """Compile one metro's records from the columnar store (no pandas)."""
+    store = store or metro_store.open_store()
+
+    def columns(table_name: str, *names: str) -> list[list]:
+        table = store.metro_slice(table_name, metro_key)
+        return [table.column(name).to_pylist() for name in names]
+
+    years, net_growth = columns('time_series', 'year', 'net_growth')
+    return MetroRecords(
+        metro_key=metro_key,
+        industry=compile_industry(*columns('industry', 'sector', 'subsector', 'headcount')),
+        salary=compile_salary(*columns('salary', 'sector', 'min_salary', 'max_salary', 'avg_salary')),
+        growth=GrowthRecords(years=array('q', years), net_growth=array('q', net_growth)),
+        employers=compile_employers(
+            columns('noncollege_employers', 'company', 'headcount'),
+            columns('college_employers', 'company', 'headcount'),
+        ),
+    )
+
+
+if __name__ == "__main__":
+    for metro_key in sys.argv[1:] or metro_store.open_store().metros:
+        records = compile_metro(metro_key)
+        print(f"{metro_key}: {len(records.industry.subsectors)} subsectors in "
+              f"{len(records.industry.sector_names)} sectors, {len(records.salary.sectors)} salary sectors, "
+              f"{len(records.growth.years)} years, {len(records.employers.companies)} employers, "
+              f"~{deep_sizeof(records):,} bytes")
@@ -0,0 +1,167 @@
+"""Search-as-you-type index over the metro catalog.
+
+Every word of a metro name and of its aliases ("DFW", "Twin Cities") is
+indexed by each of its prefixes, so a query is one dict lookup per typed
+word plus a set intersection. Queries that match no prefix fall back to
+trigram overlap, which tolerates typos ("pittsbrgh"). Matches are ranked by
+match quality, then by how often players guess them wrongly, and returned a
+page at a time, so the browser only ever receives the handful of rows on
+screen::
+
+    python metro_search.py "san j" "dfw" "pittsbrgh"
+"""
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from caching import LRUCache
+from game_config import ALL_METRO_NAMES, METRO_ALIASES
+
+PAGE_SIZE = 6
+MIN_TRIGRAM_SIMILARITY = 0.45
+
+# Match quality, best first
+EXACT = 0          # query is the whole name or alias
+NAME_PREFIX = 1    # name or alias starts with the query
+WORD_PREFIX = 2    # every query word starts some word of the name or alias
+FUZZY = 3          # trigram overlap only
+
+
+class SearchResult(NamedTuple):
+    name: str
+    alias: str | None  # the alias that matched, if it was not the name itself
+    quality: int
+
+
+def normalize(text: str) -> str:
+    """Lowercase and reduce punctuation to single spaces ("St. Louis, MO" -> "st louis mo")."""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text.lower()).split())
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MetroIndex:
+    """Prefix and trigram index over metro names and their aliases."""
+
+    def __init__(self, names=ALL_METRO_NAMES, aliases: dict | None = None):
+        aliases = METRO_ALIASES if aliases is None else aliases
+        self.names = tuple(names)
+        self._entry_of = entry_of = {name: entry for entry, name in enumerate(self.names)}
+        # Searchable keys: each name plus its aliases, as (normalized key, entry, alias)
+        self._keys = [(normalize(name), entry, None) for entry, name in enumerate(self.names)]
+        self._keys += [(normalize(alias), entry_of[name], alias)
+                       for alias, name in aliases.items() if name in entry_of]
+
+        self._prefixes = {}   # word prefix -> set of key ids
+        self._trigrams = {}   # trigram -> set of key ids
+        for key_id, (key, _, _) in enumerate(self._keys):
+            for word in key.split():
+                for end in range(1, len(word) + 1):
+                    self._prefixes.setdefault(word[:end], set()).add(key_id)
+            for gram in trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key_id)
+        self._matches = LRUCache(max_entries=4096)
+        self._picks = Counter()  # entry -> submitted wrong guesses
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _match_keys(self, query: str) -> dict[int, tuple[int, str | None]]:
+        """Return {entry: (quality, alias)} for a normalized query, best key per entry."""
+        words = query.split()
+        key_ids = None
+        for word in words:
+            found = self._prefixes.get(word, ())
+            key_ids = set(found) if key_ids is None else key_ids & found
+            if not key_ids:
+                break
+
+        matches = {}
+        if key_ids:
+            for key_id in key_ids:
+                key, entry, alias = self._keys[key_id]
+                if key == query:
+                    quality = EXACT
+                elif key.startswith(query):
+                    quality = NAME_PREFIX
+                else:
+                    quality = WORD_PREFIX
+                # Prefer the best quality, and the name itself over an alias on ties
+                rank = (quality, alias is not None)
+                if entry not in matches or rank < (matches[entry][0], matches[entry][1] is not None):
+                    matches[entry] = (quality, alias)
+            return matches
+
+        if len(query) < 3:
+            return matches
+        query_grams = trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._trigrams.get(gram, ()))
+        for key_id, count in shared.items():
+            key, entry, alias = self._keys[key_id]
+            similarity = count / len(query_grams | trigrams(key))
+            if similarity >= MIN_TRIGRAM_SIMILARITY and entry not in matches:
+                matches[entry] = (FUZZY, alias)
+        return matches
+
+    def search(self, query: str, limit: int = PAGE_SIZE, offset: int = 0) -> tuple[list[SearchResult], int]:
+        """Return one page of ranked matches and the total number of matches."""
+        query = normalize(query)
+        if not query:
+            return [], 0
+        matches = self._matches.get_or_build(query, lambda: self._match_keys(query))
+        picks = self._picks
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (item[1][0], item[1][1] is not None, -picks[item[0]], self.names[item[0]]),
+        )
+        page = [
+            SearchResult(self.names[entry], alias, quality)
+            for entry, (quality, alias) in ranked[offset:offset + limit]
+        ]
+        return page, len(ranked)
+
+    def record_pick(self, name: str) -> None:
+        """Count a submitted wrong guess; popular picks rank first among equal matches.
+
+        Callers must not record correct guesses, or the answer would rank
+        first for every later player.
+        """
+        entry = self._entry_of.get(name)
+        if entry is not None:
+            with self._lock:
+                self._picks[entry] += 1
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> MetroIndex:
+    """Return the process-wide metro index, building it on first use."""
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            _index = MetroIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    index = get_index()
+    for query in sys.argv[1:] or ["s", "san", "san j", "dfw", "twin", "pittsbrgh", "washington"]:
+        index._matches.clear()
+        started = time.perf_counter()
+        results, total = index.search(query)
+        elapsed = (time.perf_counter() - started) * 1e6
+        shown = ", ".join(f"{r.name}" + (f" ({r.alias})" if r.alias else "") for r in results)
+        print(f"{query!r:<14} {total:>4} matches  {elapsed:>7.1f} us  {shown}")
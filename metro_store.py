@@ -0,0 +1,224 @@
+"""Compiled columnar store for the metro game tables.
+
+Each metro's ``game_data/<metro>/*.csv`` tables are validated and compiled
+(by ``data_compiler.py``, only for metros that changed) into typed Arrow IPC
+files, one per table across every metro, plus a small JSON index of metro ->
+row ranges. At runtime each file is memory-mapped, so loading a metro is an
+O(1) slice of already-typed columns with no CSV parsing.
+
+Build the store ahead of time with::
+
+    python metro_store.py
+
+The app rebuilds it automatically if it is missing or older than the CSVs.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = BASE_DIR / "game_data"
+STORE_DIR = DATA_DIR / "compiled"
+INDEX_FILE = "index.json"
+STORE_VERSION = 2
+
+# ========== TABLE SCHEMAS ==========
+# Low-cardinality text columns are dictionary encoded (pandas categoricals)
+# and headcounts/salaries are stored as compact integers.
+CATEGORY = pa.dictionary(pa.int16(), pa.string())
+
+TABLE_SCHEMAS = {
+    'industry': {
+        'metro': CATEGORY,
+        'sector': CATEGORY,
+        'subsector': CATEGORY,
+        'headcount': pa.int32(),
+        'sector_pct': pa.float64(),
+        'subsector_pct': pa.float64(),
+    },
+    'salary': {
+        'metro': CATEGORY,
+        'sector': CATEGORY,
+        'avg_salary': pa.int32(),
+        'min_salary': pa.int32(),
+        'max_salary': pa.int32(),
+        'salary_spread': pa.int32(),
+    },
+    'noncollege_employers': {
+        'metro': CATEGORY,
+        'company': pa.string(),
+        'sector': CATEGORY,
+        'headcount': pa.int32(),
+        'avg_salary': pa.int32(),
+        'education_type': CATEGORY,
+    },
+    'college_employers': {
+        'metro': CATEGORY,
+        'company': pa.string(),
+        'sector': CATEGORY,
+        'headcount': pa.int32(),
+        'avg_salary': pa.int32(),
+        'education_type': CATEGORY,
+    },
+    'time_series': {
+        'metro': CATEGORY,
+        'year': pa.int16(),
+        'total_employees': pa.int32(),
+        'new_hires': pa.int32(),
+        'departures': pa.int32(),
+        'net_growth': pa.int32(),
+        'growth_rate_pct': pa.float64(),
+    },
+    'education': {
+        'metro': CATEGORY,
+        'sector': CATEGORY,
+        'college_required_pct': pa.float64(),
+        'no_college_required_pct': pa.float64(),
+    },
+    'growth': {
+        'metro': CATEGORY,
+        'sector': CATEGORY,
+        'annual_growth_rate_pct': pa.float64(),
+        'five_year_earnings_growth_pct': pa.float64(),
+    },
+}
+
+
+def source_path(table_name: str, data_dir: Path = DATA_DIR) -> Path:
+    """Return the combined all-metro copy of a table, checked against the per-metro CSVs."""
+    return data_dir / f"all_metros_{table_name}.csv"
+
+
+def source_fingerprint(data_dir: Path = DATA_DIR) -> dict:
+    """Return size/mtime of every source CSV, used to detect a stale store."""
+    fingerprint = {}
+    # scandir rather than glob: this runs on every app start, over every metro's files
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".csv"):
+                stat = entry.stat()
+                fingerprint[entry.name] = [stat.st_size, stat.st_mtime_ns]
+            elif entry.is_dir():
+                with os.scandir(entry.path) as files:
+                    for file in files:
+                        if file.name.endswith(".csv"):
+                            stat = file.stat()
+                            fingerprint[f"{entry.name}/{file.name}"] = [stat.st_size, stat.st_mtime_ns]
+    return dict(sorted(fingerprint.items()))
+
+
+def metro_source_hashes(data_dir: Path = DATA_DIR) -> dict:
+    """Return a content hash of each metro's rows across every source CSV."""
+    digests = {}
+    for table_name in TABLE_SCHEMAS:
+        header, *rows = source_path(table_name, data_dir).read_bytes().splitlines()
+        for row in rows:
+            metro = row.split(b',', 1)[0].decode('utf-8')
+            digest = digests.get(metro)
+            if digest is None:
+                digest = digests[metro] = hashlib.sha256()
+            digest.update(table_name.encode('utf-8') + b'\0' + header + b'\0' + row + b'\n')
+    return {metro: digest.hexdigest() for metro, digest in digests.items()}
+
+
+# ========== COMPILATION ==========
+def plain_types(table_name: str) -> dict:
+    """Column types of a table as parsed from CSV, before dictionary encoding."""
+    return {
+        name: (pa.string() if pa.types.is_dictionary(dtype) else dtype)
+        for name, dtype in TABLE_SCHEMAS[table_name].items()
+    }
+
+
+def build_store(data_dir: Path = DATA_DIR, store_dir: Path = STORE_DIR) -> dict:
+    """Compile the metros whose CSVs changed into the Arrow store and return its index."""
+    import data_compiler  # imported lazily: the compiler and its validation only run on a rebuild
+    return data_compiler.compile_data(data_dir, store_dir).index
+
+
+# ========== RUNTIME ACCESS ==========
+class MetroStore:
+    """Memory-mapped view over the compiled tables with a metro row index."""
+
+    def __init__(self, store_dir: Path, index: dict):
+        self.store_dir = store_dir
+        self.index = index
+        self.tables = {}
+        for table_name in TABLE_SCHEMAS:
+            source = pa.memory_map(str(store_dir / f"{table_name}.arrow"), 'r')
+            self.tables[table_name] = pa.ipc.open_file(source).read_all()
+
+    @property
+    def metros(self) -> list[str]:
+        """Metro keys present in the store."""
+        return sorted(self.index['tables']['industry'])
+
+    def metro_slice(self, table_name: str, metro_key: str) -> pa.Table:
+        """Return the zero-copy Arrow slice of one table for a metro."""
+        offset, length = self.index['tables'][table_name].get(metro_key, (0, 0))
+        return self.tables[table_name].slice(offset, length)
+
+    def metro_frame(self, table_name: str, metro_key: str):
+        """Return one table for a metro as a pandas DataFrame."""
+        frame = self.metro_slice(table_name, metro_key).to_pandas()
+        for name, dtype in TABLE_SCHEMAS[table_name].items():
+            if pa.types.is_dictionary(dtype):
+                # Slices share the store-wide dictionary; keep only this metro's categories
+                frame[name] = frame[name].cat.remove_unused_categories()
+        return frame
+
+    def table_frame(self, table_name: str):
+        """Return one table across every metro as a pandas DataFrame."""
+        return self.tables[table_name].to_pandas()
+
+    def load_metro_tables(self, metro_key: str) -> dict:
+        """Return every table for a metro as DataFrames keyed by table name."""
+        return {name: self.metro_frame(name, metro_key) for name in TABLE_SCHEMAS}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def read_index(store_dir: Path = STORE_DIR):
+    """Return the store's index, or None if it is missing or unreadable."""
+    try:
+        return json.loads((store_dir / INDEX_FILE).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def is_stale(index, data_dir: Path = DATA_DIR) -> bool:
+    """True if the index is missing, from an older format, or older than the CSVs."""
+    if not index or index.get('version') != STORE_VERSION:
+        return True
+    return index.get('sources') != source_fingerprint(data_dir)
+
+
+def open_store(data_dir: Path = DATA_DIR, store_dir: Path = STORE_DIR) -> MetroStore:
+    """Return the process-wide store, compiling it first if it is stale."""
+    global _store
+    if _store is not None:
+        return _store
+    with _store_lock:
+        if _store is None:
+            index = read_index(store_dir)
+            if is_stale(index, data_dir):
+                index = build_store(data_dir, store_dir)
+            _store = MetroStore(store_dir, index)
+    return _store
+
+
+def load_metro_tables(metro_key: str) -> dict:
+    """Return every table for a metro from the process-wide store."""
+    return open_store().load_metro_tables(metro_key)
+
+
+if __name__ == "__main__":
+    built = build_store()
+    metros = sorted(built['tables']['industry'])
+    print(f"Compiled {len(TABLE_SCHEMAS)} tables for {len(metros)} metros into {STORE_DIR}")
@@ -0,0 +1,136 @@
+"""Percentile ranks of every metro on every comparison metric.
+
+Each metric is a vectorized function of the all-metro tables returning one
+value per metro. ``compute_percentile_table`` evaluates them all into a
+metro x metric matrix and ranks every column at once, so adding a metric or
+more metros is one recompute. The result is cached per process and lookups
+are a dict hit plus an array index::
+
+    python percentile_engine.py
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import metro_store
+
+# Years between the start and end of the employment growth window
+GROWTH_WINDOW_YEARS = 5
+
+
+def _latest_employment(tables: dict) -> pd.DataFrame:
+    return tables['time_series'].pivot_table(
+        index='metro', columns='year', values='total_employees', observed=True
+    )
+
+
+def five_year_employment_growth(tables: dict) -> pd.Series:
+    """Percent change in total employment over the last five years of data"""
+    employment = _latest_employment(tables)
+    latest_year = employment.columns.max()
+    base_year = latest_year - GROWTH_WINDOW_YEARS
+    return (employment[latest_year] / employment[base_year] - 1) * 100
+
+
+def number_of_workers(tables: dict) -> pd.Series:
+    """Total employment in the latest year"""
+    employment = _latest_employment(tables)
+    return employment[employment.columns.max()]
+
+
+def _sector_headcount_weighted(tables: dict, table_name: str, column: str) -> pd.Series:
+    """Average a per-sector column within each metro, weighted by sector headcount"""
+    weights = tables['industry'].groupby(['metro', 'sector'], observed=True)['headcount'].sum()
+    # Float, as the store's int32 salaries times headcounts overflow
+    frame = tables[table_name].set_index(['metro', 'sector'])[column].astype(float).to_frame('value')
+    frame['weight'] = weights.reindex(frame.index).fillna(0).to_numpy(dtype=float)
+    frame['weighted'] = frame['value'] * frame['weight']
+    totals = frame.groupby(level='metro', observed=True)[['weighted', 'weight']].sum()
+    return totals['weighted'] / totals['weight']
+
+
+def average_salary(tables: dict) -> pd.Series:
+    """Headcount-weighted average salary across sectors"""
+    return _sector_headcount_weighted(tables, 'salary', 'avg_salary')
+
+
+def salary_growth(tables: dict) -> pd.Series:
+    """Headcount-weighted five-year earnings growth across sectors"""
+    return _sector_headcount_weighted(tables, 'growth', 'five_year_earnings_growth_pct')
+
+
+# Gauge label -> metric function, in display order
+METRICS = {
+    '5-Year Employment Growth': five_year_employment_growth,
+    'Number of Workers': number_of_workers,
+    'Average Salary': average_salary,
+    'Salary Growth': salary_growth,
+}
+METRIC_TABLES = ('industry', 'salary', 'growth', 'time_series')
+
+
+def percentile_ranks(values: pd.DataFrame) -> pd.DataFrame:
+    """Mid-rank percentile of each value within its column, as integers 0-100
+
+    A metro's rank is the share of metros below it plus half the share tied
+    with it, so the lowest of five metros sits at 10, not 0.
+    """
+    ranks = (values.rank(method='average') - 0.5) / values.count() * 100
+    return ranks.round().astype('Int64')
+
+
+class PercentileTable:
+    """Metro x metric matrix of raw values and percentile ranks."""
+
+    __slots__ = ('metros', 'metrics', 'values', 'ranks', '_row', '_column')
+
+    def __init__(self, values: pd.DataFrame):
+        self.metros = tuple(values.index)
+        self.metrics = tuple(values.columns)
+        self.values = values.to_numpy(dtype=float)
+        self.ranks = percentile_ranks(values).to_numpy(dtype=float, na_value=np.nan)
+        self._row = {metro: row for row, metro in enumerate(self.metros)}
+        self._column = {metric: column for column, metric in enumerate(self.metrics)}
+
+    def rank(self, metro_key: str, metric: str) -> int:
+        """Return one metro's percentile rank on one metric."""
+        return int(self.ranks[self._row[metro_key], self._column[metric]])
+
+    def metro_ranks(self, metro_key: str) -> dict[str, int]:
+        """Return {metric: percentile rank} for a metro, in metric order."""
+        row = self.ranks[self._row[metro_key]]
+        return {metric: int(rank) for metric, rank in zip(self.metrics, row) if not np.isnan(rank)}
+
+
+def compute_percentile_table(tables: dict, metrics: dict = METRICS) -> PercentileTable:
+    """Evaluate every metric over the all-metro tables and rank the matrix"""
+    values = pd.DataFrame({name: metric(tables) for name, metric in metrics.items()})
+    values.index = values.index.astype(str)
+    return PercentileTable(values.sort_index())
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_percentile_table() -> PercentileTable:
+    """Return the process-wide percentile table, computing it on first use."""
+    global _table
+    if _table is not None:
+        return _table
+    with _table_lock:
+        if _table is None:
+            store = metro_store.open_store()
+            tables = {name: store.table_frame(name) for name in METRIC_TABLES}
+            _table = compute_percentile_table(tables)
+    return _table
+
+
+if __name__ == "__main__":
+    table = get_percentile_table()
+    width = max(len(metric) for metric in table.metrics)
+    print(f"{'metro':<14}" + "".join(f"{metric:>{width + 2}}" for metric in table.metrics))
+    for metro in table.metros:
+        ranks = table.metro_ranks(metro)
+        print(f"{metro:<14}" + "".join(f"{ranks.get(metric, '-'):>{width + 2}}" for metric in table.metrics))
@@ -0,0 +1,261 @@
+"""Lightweight timing spans and rerun metrics for the render path.
+
+``span(name)`` records wall-clock and thread CPU time for a block of code
+into a process-wide registry. Recent raw samples feed the load-test
+harness's per-step breakdown; every sample also lands in a cumulative
+histogram, as does each whole rerun tagged with its cause (``start_rerun``).
+``count(name)`` bumps a plain event counter (e.g. failed background writes).
+
+The histograms and counters are exported in Prometheus text format by
+``start_exporter``: served at ``/metrics`` on ``GTM_METRICS_PORT`` and/or
+written to ``GTM_METRICS_FILE`` every ``GTM_METRICS_INTERVAL`` seconds.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PORT_ENV = "GTM_METRICS_PORT"
+HOST_ENV = "GTM_METRICS_HOST"
+FILE_ENV = "GTM_METRICS_FILE"
+INTERVAL_ENV = "GTM_METRICS_INTERVAL"
+
+# Raw samples kept per step for snapshot(); histograms keep everything
+MAX_SAMPLES = 10_000
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_spans = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram of durations in seconds."""
+
+    __slots__ = ('counts', 'count', 'sum', 'cpu_sum')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.cpu_sum = 0.0
+
+    def observe(self, seconds: float, cpu_seconds: float = 0.0) -> None:
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.cpu_sum += cpu_seconds
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf."""
+        pairs, running = [], 0
+        for bound, count in zip(BUCKETS, self.counts):
+            running += count
+            pairs.append((f"{bound:g}", running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+_span_histograms = defaultdict(Histogram)   # span name -> Histogram
+_rerun_histograms = defaultdict(Histogram)  # rerun cause -> Histogram
+_counters = defaultdict(int)                # event name -> count
+
+
+@contextmanager
+def span(name: str):
+    """Time a block of code under a step name."""
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+
+def record(name: str, wall_seconds: float, cpu_seconds: float = 0.0) -> None:
+    """Record one timing sample for a step."""
+    with _lock:
+        _spans[name].append((wall_seconds, cpu_seconds))
+        _span_histograms[name].observe(wall_seconds, cpu_seconds)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to an event counter."""
+    with _lock:
+        _counters[name] += value
+
+
+def counters() -> dict[str, int]:
+    """Return a copy of every event counter."""
+    with _lock:
+        return dict(_counters)
+
+
+class RerunTimer:
+    """Times one script run from start to finish under the cause that triggered it."""
+
+    __slots__ = ('cause', 'wall_start', 'cpu_start', 'finished')
+
+    def __init__(self, cause: str):
+        self.cause = cause
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.finished = False
+
+    def finish(self) -> None:
+        """Record the rerun; later calls are ignored."""
+        if self.finished:
+            return
+        self.finished = True
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.thread_time() - self.cpu_start
+        with _lock:
+            _rerun_histograms[self.cause].observe(wall, cpu)
+
+
+def start_rerun(cause: str) -> RerunTimer:
+    """Start timing a rerun; call ``finish()`` on the result when it ends."""
+    return RerunTimer(cause)
+
+
+def snapshot() -> dict[str, list[tuple[float, float]]]:
+    """Return a copy of every recorded (wall, cpu) sample keyed by step."""
+    with _lock:
+        return {name: list(samples) for name, samples in _spans.items()}
+
+
+def rerun_totals() -> dict[str, dict]:
+    """Return {cause: count, wall and CPU seconds} for recorded reruns."""
+    with _lock:
+        return {
+            cause: {'count': histogram.count, 'seconds': histogram.sum, 'cpu_seconds': histogram.cpu_sum}
+            for cause, histogram in sorted(_rerun_histograms.items())
+        }
+
+
+def reset() -> None:
+    """Drop all recorded samples and histograms."""
+    with _lock:
+        _spans.clear()
+        _span_histograms.clear()
+        _rerun_histograms.clear()
+        _counters.clear()
+
+
+# ========== PROMETHEUS EXPORT ==========
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(metric: str, label: str, histograms: dict) -> list[str]:
+    lines = []
+    for key, histogram in sorted(histograms.items()):
+        labels = f'{label}="{_label(key)}"'
+        for bound, count in histogram.cumulative():
+            lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+def prometheus_text() -> str:
+    """Render every histogram and counter in Prometheus text exposition format."""
+    with _lock:
+        spans = {name: _copy(histogram) for name, histogram in _span_histograms.items()}
+        reruns = {cause: _copy(histogram) for cause, histogram in _rerun_histograms.items()}
+        events = dict(_counters)
+    lines = [
+        "# HELP gtm_span_seconds Wall-clock time of instrumented render steps.",
+        "# TYPE gtm_span_seconds histogram",
+        *_histogram_lines("gtm_span_seconds", "span", spans),
+        "# HELP gtm_span_cpu_seconds_total Thread CPU time spent in instrumented render steps.",
+        "# TYPE gtm_span_cpu_seconds_total counter",
+        *(f'gtm_span_cpu_seconds_total{{span="{_label(name)}"}} {histogram.cpu_sum:.6f}'
+          for name, histogram in sorted(spans.items())),
+        "# HELP gtm_rerun_seconds Wall-clock time of whole script reruns by cause.",
+        "# TYPE gtm_rerun_seconds histogram",
+        *_histogram_lines("gtm_rerun_seconds", "cause", reruns),
+        "# HELP gtm_reruns_total Script reruns by cause.",
+        "# TYPE gtm_reruns_total counter",
+        *(f'gtm_reruns_total{{cause="{_label(cause)}"}} {histogram.count}'
+          for cause, histogram in sorted(reruns.items())),
+        "# HELP gtm_rerun_cpu_seconds_total Thread CPU time of script reruns by cause.",
+        "# TYPE gtm_rerun_cpu_seconds_total counter",
+        *(f'gtm_rerun_cpu_seconds_total{{cause="{_label(cause)}"}} {histogram.cpu_sum:.6f}'
+          for cause, histogram in sorted(reruns.items())),
+        "# HELP gtm_events_total Counted events by name.",
+        "# TYPE gtm_events_total counter",
+        *(f'gtm_events_total{{event="{_label(name)}"}} {value}' for name, value in sorted(events.items())),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    copy = Histogram()
+    copy.counts = list(histogram.counts)
+    copy.count, copy.sum, copy.cpu_sum = histogram.count, histogram.sum, histogram.cpu_sum
+    return copy
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics(path: Path | str) -> None:
+    """Write the metrics to a file atomically (for a node-exporter textfile collector)."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(prometheus_text(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_periodically(path: str, interval: float) -> None:
+    while True:
+        try:
+            write_metrics(path)
+        except OSError:
+            logger.exception("Could not write metrics to %s", path)
+        time.sleep(interval)
+
+
+_exporter_started = False
+
+
+def start_exporter() -> None:
+    """Start the configured metrics endpoint and/or file writer (once per process)."""
+    global _exporter_started
+    with _lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    port = os.environ.get(PORT_ENV)
+    if port:
+        # Local by default; set GTM_METRICS_HOST=0.0.0.0 to expose it to a scraper
+        server = ThreadingHTTPServer((os.environ.get(HOST_ENV, "127.0.0.1"), int(port)), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info("Serving metrics on port %s", port)
+    path = os.environ.get(FILE_ENV)
+    if path:
+        interval = float(os.environ.get(INTERVAL_ENV, 15))
+        threading.Thread(target=_write_periodically, args=(path, interval),
+                         name="metrics-file", daemon=True).start()
@@ -0,0 +1,351 @@
+"""Head-to-head race rooms with updates pushed across sessions.
+
+Players in a room race on the same mystery metro and see each other's guess
+counts and finishes live. Every join, guess and finish is published to the
+process-wide ``RaceHub``, which fans it out to the room's other subscribed
+sessions by asking each for one rerun; nothing polls. A subscriber that
+already has a rerun pending is not asked again until it has rendered the
+room, so however fast events arrive each player reruns at most once per
+event, and a room of N players costs about N - 1 reruns per event. A
+session that cannot be woken (closed, or mid-reconnect) keeps its place on
+the board as disconnected and is re-attached the next time it renders the
+room or publishes::
+
+    python race_hub.py --players 50 --events 200
+"""
+import argparse
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
+MAX_PLAYERS_ENV = "GTM_RACE_MAX_PLAYERS"
+ROOM_TTL_ENV = "GTM_RACE_ROOM_TTL"
+MAX_PLAYERS = int(os.environ.get(MAX_PLAYERS_ENV, 50))
+# Rooms nobody has published to for this long are dropped
+ROOM_TTL_SECONDS = float(os.environ.get(ROOM_TTL_ENV, 2 * 3600))
+CODE_LENGTH = 4
+CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ"  # no I or O to misread
+RERUN_CAUSE = 'race'
+
+logger = logging.getLogger(__name__)
+
+
+class RaceStanding(NamedTuple):
+    """One row of a room's scoreboard."""
+    name: str
+    guesses: int
+    score: int
+    finished: bool
+    won: bool
+    place: int    # finishing place among winners, 0 until solved
+    you: bool
+    connected: bool
+
+
+class RacePlayer:
+    """A player's progress in a room and how to wake their session."""
+
+    __slots__ = ('player_id', 'name', 'guesses', 'score', 'finished', 'won', 'place', 'notify', 'pending')
+
+    def __init__(self, player_id: str, name: str, notify: Callable[[], bool] | None):
+        self.player_id = player_id
+        self.name = name
+        self.guesses = 0
+        self.score = 0
+        self.finished = False
+        self.won = False
+        self.place = 0
+        self.notify = notify    # asks the session to rerun; None while disconnected
+        self.pending = False    # a rerun was requested and the room not rendered since
+
+
+class RaceRoom:
+    """The players racing on one mystery metro."""
+
+    __slots__ = ('code', 'metro_key', 'players', 'winners', 'last_event')
+
+    def __init__(self, code: str, metro_key: str):
+        self.code = code
+        self.metro_key = metro_key
+        self.players = {}     # player_id -> RacePlayer, in join order
+        self.winners = 0
+        self.last_event = time.monotonic()
+
+
+class RaceHub:
+    """Rooms by code, with publish/subscribe fan-out to the players' sessions."""
+
+    def __init__(self, max_players: int = MAX_PLAYERS, room_ttl: float = ROOM_TTL_SECONDS):
+        self.max_players = max_players
+        self.room_ttl = room_ttl
+        self._rooms = {}
+        self._lock = threading.Lock()
+        self._events = 0
+        self._notified = 0
+        self._coalesced = 0
+
+    def create_room(self, metro_key: str) -> str:
+        """Open a room racing on metro_key and return its code."""
+        with self._lock:
+            self._prune()
+            while True:
+                code = "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+                if code not in self._rooms:
+                    break
+            self._rooms[code] = RaceRoom(code, metro_key)
+        return code
+
+    def room_metro(self, code: str) -> str | None:
+        """The mystery metro of an open room (None if there is no such room)."""
+        with self._lock:
+            room = self._rooms.get(code)
+            return room.metro_key if room is not None else None
+
+    def join(self, code: str, name: str, notify: Callable[[], bool] | None) -> str | None:
+        """Add a player to a room and return their player ID (None if the room is gone or full)."""
+        with self._lock:
+            room = self._rooms.get(code)
+            if room is None or len(room.players) >= self.max_players:
+                return None
+            player_id = secrets.token_hex(4)
+            room.players[player_id] = RacePlayer(player_id, name or f"Player {len(room.players) + 1}", notify)
+        self._fan_out(room, player_id)
+        return player_id
+
+    def leave(self, code: str, player_id: str) -> None:
+        """Remove a player from a room."""
+        with self._lock:
+            room = self._rooms.get(code)
+            if room is None or room.players.pop(player_id, None) is None:
+                return
+        self._fan_out(room, player_id)
+
+    def publish(self, code: str, player_id: str, state, notify: Callable[[], bool] | None = None) -> int:
+        """Record a player's game_engine.GameState and push it; return how many sessions were asked to rerun.
+
+        notify re-attaches a player whose session was marked disconnected.
+        """
+        with self._lock:
+            room = self._rooms.get(code)
+            player = room.players.get(player_id) if room is not None else None
+            if player is None:
+                return 0
+            if player.notify is None:
+                player.notify = notify
+            player.guesses = state.guesses_made
+            player.score = state.score
+            if state.game_won and not player.won:
+                room.winners += 1
+                player.place = room.winners
+            player.finished = state.game_over
+            player.won = state.game_won
+        return self._fan_out(room, player_id)
+
+    def standings(self, code: str, player_id: str, notify: Callable[[], bool] | None = None) -> list[RaceStanding]:
+        """The room's scoreboard as player_id sees it; marks their pushed update as delivered.
+
+        notify re-attaches the player if their session was marked disconnected.
+        """
+        with self._lock:
+            room = self._rooms.get(code)
+            if room is None:
+                return []
+            player = room.players.get(player_id)
+            if player is not None:
+                player.pending = False
+                if player.notify is None:
+                    player.notify = notify
+            rows = [
+                RaceStanding(player.name, player.guesses, player.score, player.finished, player.won,
+                             player.place, player.player_id == player_id, player.notify is not None)
+                for player in room.players.values()
+            ]
+        # Winners by place, then players still guessing (fewest guesses left first), then the rest
+        return sorted(rows, key=lambda row: (not row.won, row.place, row.finished, -row.guesses))
+
+    def is_pending(self, code: str, player_id: str) -> bool:
+        """Whether a pushed update is waiting for player_id to render the room."""
+        with self._lock:
+            room = self._rooms.get(code)
+            player = room.players.get(player_id) if room is not None else None
+            return player is not None and player.pending
+
+    def pending_players(self, code: str) -> set[str]:
+        """IDs of the players in a room with a pushed rerun not yet rendered."""
+        with self._lock:
+            room = self._rooms.get(code)
+            return {pid for pid, player in room.players.items() if player.pending} if room else set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'rooms': len(self._rooms),
+                'players': sum(len(room.players) for room in self._rooms.values()),
+                'events': self._events,
+                'reruns_requested': self._notified,
+                'coalesced': self._coalesced,
+            }
+
+    def _fan_out(self, room: RaceRoom, source_id: str) -> int:
+        """Ask every other subscribed player in the room to rerun once."""
+        with self._lock:
+            self._events += 1
+            room.last_event = time.monotonic()
+            targets = []
+            for player in room.players.values():
+                if player.player_id == source_id or player.notify is None:
+                    continue
+                if player.pending:
+                    # Its pending rerun will render this event too
+                    self._coalesced += 1
+                else:
+                    player.pending = True
+                    targets.append(player)
+            self._notified += len(targets)
+        # Outside the lock: a notify schedules work on another session's event loop
+        for player in targets:
+            try:
+                alive = player.notify()
+            except Exception:
+                logger.exception("Race push to %s in room %s failed", player.name, room.code)
+                alive = False
+            if not alive:
+                # Closed or reconnecting: keep the standing, stop pushing until the session is back
+                with self._lock:
+                    player.notify = None
+                    player.pending = False
+        return len(targets)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.room_ttl
+        for code in [code for code, room in self._rooms.items() if room.last_event < cutoff]:
+            del self._rooms[code]
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub() -> RaceHub:
+    """Return the process-wide race hub."""
+    global _hub
+    if _hub is not None:
+        return _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = RaceHub()
+    return _hub
+
+
+# ========== STREAMLIT SESSIONS ==========
+@lru_cache(maxsize=1)
+def pushes_supported() -> bool:
+    """Whether this Streamlit has the internals rerun_session needs; logs once if not."""
+    # imported lazily: the hub itself is Streamlit-free
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.app_session import AppSession
+    from streamlit.runtime.session_manager import SessionManager
+
+    needed = ((Runtime, 'instance'), (SessionManager, 'get_active_session_info'),
+              (AppSession, '_call_soon_on_event_loop'), (AppSession, 'request_rerun'))
+    missing = [f"{owner.__name__}.{name}" for owner, name in needed if not hasattr(owner, name)]
+    if missing:
+        logger.error("Race pushes are off: this Streamlit lacks %s (see requirements.txt)", ", ".join(missing))
+    return not missing
+
+
+def rerun_session(session_id: str) -> bool:
+    """Ask a Streamlit browser session to rerun, from any thread; False if it has gone.
+
+    Streamlit has no public call for one session to wake another, so this
+    looks the session up in the runtime's session manager and schedules
+    ``request_rerun(None)`` (a rerun that keeps widget state, as Streamlit's
+    own health check does) on the event loop that owns the session.
+    """
+    from streamlit.runtime import Runtime  # imported lazily: the hub itself is Streamlit-free
+
+    if not pushes_supported() or not Runtime.exists():
+        return False
+    session_mgr = getattr(Runtime.instance(), '_session_mgr', None)
+    if session_mgr is None:
+        raise RuntimeError("Streamlit's runtime has no _session_mgr")
+    info = session_mgr.get_active_session_info(session_id)
+    if info is None:
+        return False
+    app_session = info.session
+    app_session._call_soon_on_event_loop(lambda: app_session.request_rerun(None))
+    return True
+
+
+def session_notifier(session_id: str) -> Callable[[], bool]:
+    """Return notify() for Streamlit session session_id.
+
+    It touches nothing of the target session's state: the woken run finds
+    its update pending (``RaceHub.is_pending``) and tags itself as a race rerun.
+    """
+    return lambda: rerun_session(session_id)
+
+
+# ========== FAN-OUT SIMULATION ==========
+def simulate(players: int, events: int, seed: int = 0) -> dict:
+    """Publish random guesses in one room of counting subscribers that render between events."""
+    from game_config import METRO_IDS, METROS
+    import game_engine
+
+    rng = random.Random(seed)
+    hub = RaceHub(max_players=players)
+    metro_key = rng.choice(list(METROS))
+    code = hub.create_room(metro_key)
+    reruns = [0] * players
+
+    def counter(index: int) -> Callable[[], bool]:
+        def notify() -> bool:
+            reruns[index] += 1
+            return True
+        return notify
+
+    player_ids = [hub.join(code, f"Player {index + 1}", counter(index)) for index in range(players)]
+    states = [game_engine.new_game(metro_key, METRO_IDS[METROS[metro_key]['name']]) for _ in range(players)]
+    candidates = list(METRO_IDS.values())
+    for player_id in player_ids:
+        hub.standings(code, player_id)   # every session has rendered the room once
+    joined = sum(reruns)
+
+    started = time.perf_counter()
+    for _ in range(events):
+        index = rng.randrange(players)
+        if states[index].game_over:
+            states[index] = game_engine.new_game(metro_key, states[index].answer)
+        states[index] = game_engine.reduce(states[index], game_engine.Guess(rng.choice(candidates)))
+        hub.publish(code, player_ids[index], states[index])
+        # Pushed reruns land before the next event
+        for player_id in hub.pending_players(code):
+            hub.standings(code, player_id)
+    elapsed = time.perf_counter() - started
+    pushed = sum(reruns) - joined
+    return {
+        'players': players,
+        'events': events,
+        'reruns': pushed,
+        'reruns_per_player_per_event': pushed / (events * (players - 1)) if events and players > 1 else 0.0,
+        'seconds_per_event': elapsed / events if events else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate push fan-out in one race room")
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    result = simulate(args.players, args.events, args.seed)
+    print(
+        f"{result['players']} players, {result['events']} events: {result['reruns']:,} pushed reruns "
+        f"({result['reruns_per_player_per_event']:.2f} per other player per event), "
+        f"{result['seconds_per_event'] * 1e6:.0f} µs per event (publish, fan-out and the scoreboard reads)"
+    )
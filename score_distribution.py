@@ -0,0 +1,211 @@
+"""Per-metro score histograms for the result modal.
+
+Scores only ever land on multiples of ``WRONG_GUESS_PENALTY`` (50, 40, ... 0),
+so a metro's distribution is six bin counts plus a cumulative table: "you
+outscored X%" is one lookup however many plays the counts came from. Chart
+arrays are derived once per histogram and the single-trace figure is cached
+per (metro, highlighted bin).
+
+Counts come from today's real plays in ``score_store`` once a metro has
+``GTM_MIN_REAL_PLAYS`` of them, and from a seeded placeholder until then.
+Histograms are re-read at most every ``GTM_SCORE_REFRESH_SECONDS``.
+"""
+import math
+import os
+import random
+import time
+from collections import Counter
+
+import plotly.graph_objects as go
+
+import score_store
+from caching import LRUCache
+from game_config import (
+    DEFAULT_SCORE_PROFILE,
+    REVELIO_PALETTE,
+    SCORE_DISTRIBUTION_PROFILES,
+    get_chart_height,
+    get_margin,
+    get_text_size,
+)
+from game_engine import MAX_SCORE, WRONG_GUESS_PENALTY
+
+SCORE_BINS = tuple(range(0, MAX_SCORE + 1, WRONG_GUESS_PENALTY))
+MOCK_SAMPLE_SIZE = 480
+MIN_REAL_PLAYS = int(os.environ.get("GTM_MIN_REAL_PLAYS", 20))
+REFRESH_SECONDS = float(os.environ.get("GTM_SCORE_REFRESH_SECONDS", 5))
+
+
+class ScoreHistogram:
+    """Immutable score counts per bin with cumulative and chart arrays."""
+
+    __slots__ = ('counts', 'total', 'below', 'shares', 'hover_text', 'simulated')
+
+    def __init__(self, counts, simulated: bool = False):
+        self.simulated = simulated
+        self.counts = tuple(int(count) for count in counts)
+        if len(self.counts) != len(SCORE_BINS):
+            raise ValueError(f"Expected {len(SCORE_BINS)} bin counts, got {len(self.counts)}")
+        self.total = sum(self.counts)
+        # below[i] = plays that scored less than SCORE_BINS[i]
+        below = [0]
+        for count in self.counts:
+            below.append(below[-1] + count)
+        self.below = tuple(below)
+        self.shares = tuple(count / self.total * 100 if self.total else 0.0 for count in self.counts)
+        self.hover_text = tuple(
+            f"Score: {score - WRONG_GUESS_PENALTY // 2}-{score + WRONG_GUESS_PENALTY // 2 - 1}"
+            f"<br>Share: {share:.1f}%"
+            for score, share in zip(SCORE_BINS, self.shares)
+        )
+
+    @classmethod
+    def from_scores(cls, scores, simulated: bool = False) -> "ScoreHistogram":
+        """Bin an iterable of raw scores."""
+        return cls.from_score_counts(Counter(scores), simulated)
+
+    @classmethod
+    def from_score_counts(cls, score_counts: dict, simulated: bool = False) -> "ScoreHistogram":
+        """Bin a {score: plays} mapping."""
+        counts = [0] * len(SCORE_BINS)
+        for score, plays in score_counts.items():
+            counts[bin_index(score)] += plays
+        return cls(counts, simulated)
+
+    @property
+    def average(self) -> float:
+        if not self.total:
+            return 0.0
+        return sum(score * count for score, count in zip(SCORE_BINS, self.counts)) / self.total
+
+    def percent_outscored(self, score: int) -> float:
+        """Share of plays that scored strictly below score."""
+        return self.below[bin_index(score)] / self.total * 100 if self.total else 0.0
+
+    def percent_tied(self, score: int) -> float:
+        """Share of plays that landed in the same bin as score."""
+        return self.shares[bin_index(score)]
+
+
+def bin_index(score) -> int:
+    """Return the bin a score falls in (nearest multiple of the penalty, clamped)."""
+    index = int(round(score / WRONG_GUESS_PENALTY))
+    return max(0, min(index, len(SCORE_BINS) - 1))
+
+
+def mock_histogram(metro_key: str, sample_size: int = MOCK_SAMPLE_SIZE) -> ScoreHistogram:
+    """Return a deterministic placeholder distribution for a metro."""
+    profile = SCORE_DISTRIBUTION_PROFILES.get(metro_key, DEFAULT_SCORE_PROFILE)
+    rng = random.Random(f"{metro_key}-scores")
+    mean = profile.get('mean', DEFAULT_SCORE_PROFILE['mean'])
+    std = max(profile.get('std', DEFAULT_SCORE_PROFILE['std']), 1)
+
+    weights = []
+    for score in SCORE_BINS:
+        z = (score - mean) / std
+        weights.append(math.exp(-0.5 * z * z) + 0.25)  # add baseline so tails stay represented
+
+    draws_needed = max(sample_size - len(SCORE_BINS), 0)
+    sampled = rng.choices(SCORE_BINS, weights=weights, k=draws_needed)
+    # Ensure every score bucket is represented at least once
+    sampled.extend(SCORE_BINS)
+    return ScoreHistogram.from_scores(sampled, simulated=True)
+
+
+# ========== CHART ==========
+def build_distribution_figure(histogram: ScoreHistogram, player_bin: int | None = None) -> go.Figure:
+    """Single-trace bar chart of a histogram with the player's bin highlighted"""
+    colors = [REVELIO_PALETTE["purple"]] * len(SCORE_BINS)
+    line_widths = [0] * len(SCORE_BINS)
+    opacities = [0.85] * len(SCORE_BINS)
+    if player_bin is not None:
+        colors[player_bin] = REVELIO_PALETTE["accent"]
+        line_widths[player_bin] = 2
+        opacities[player_bin] = 1.0
+
+    fig = go.Figure(go.Bar(
+        x=SCORE_BINS,
+        y=histogram.shares,
+        width=WRONG_GUESS_PENALTY - 1,  # Slightly less than a bin to create small gaps
+        marker=dict(color=colors, opacity=opacities, line=dict(width=line_widths, color='white')),
+        hovertext=histogram.hover_text,
+        hovertemplate='%{hovertext}<extra></extra>',
+        showlegend=False,
+    ))
+
+    if player_bin is not None:
+        fig.add_annotation(
+            x=SCORE_BINS[player_bin],
+            y=histogram.shares[player_bin],
+            text='Your score',
+            showarrow=False,
+            yanchor='bottom',
+            yshift=4,
+            font=dict(size=get_text_size('score_distribution', 16), color=REVELIO_PALETTE["accent"], weight=600),
+        )
+
+    fig.update_layout(
+        height=get_chart_height('score_distribution', 450),
+        margin=get_margin('score_distribution', {'t': 50, 'l': 40, 'r': 30, 'b': 40}),
+        paper_bgcolor='white',
+        plot_bgcolor='white',
+        bargap=0.08,
+        xaxis=dict(
+            title='Player Score (out of 50)',
+            title_font=dict(size=get_text_size('score_distribution', 18), weight=600),
+            tickfont=dict(size=get_text_size('score_distribution', 16)),
+            tickmode='array',
+            tickvals=list(SCORE_BINS),
+            range=[-2, 52]
+        ),
+        yaxis=dict(
+            title='Share of Players',
+            title_font=dict(size=get_text_size('score_distribution', 18), weight=600),
+            tickfont=dict(size=get_text_size('score_distribution', 16)),
+            ticksuffix='%'
+        )
+    )
+    return fig
+
+
+# ========== CACHE ==========
+HISTOGRAM_CACHE = LRUCache(max_entries=int(os.environ.get("GTM_HISTOGRAM_CACHE_ENTRIES", 256)))
+
+
+def load_histogram(metro_key: str, day: str | None = None) -> ScoreHistogram:
+    """Return the day's real-play histogram, or the placeholder if there are too few plays."""
+    histogram = ScoreHistogram.from_score_counts(score_store.get_store().histogram(metro_key, day))
+    if histogram.total >= MIN_REAL_PLAYS:
+        return histogram
+    return mock_histogram(metro_key)
+
+
+def get_histogram(metro_key: str) -> ScoreHistogram:
+    """Return today's histogram for a metro (cached process-wide, refreshed periodically)."""
+    day = score_store.today()
+    refresh_slot = int(time.time() // REFRESH_SECONDS) if REFRESH_SECONDS > 0 else 0
+    return HISTOGRAM_CACHE.get_or_build(
+        ('histogram', metro_key, day, refresh_slot),
+        lambda: load_histogram(metro_key, day),
+    )
+
+
+def get_distribution_figure(metro_key: str, player_score: int) -> go.Figure:
+    """Return the metro's distribution chart with the player's bin highlighted (cached)."""
+    histogram = get_histogram(metro_key)
+    player_bin = bin_index(player_score)
+    return HISTOGRAM_CACHE.get_or_build(
+        ('figure', metro_key, player_bin, histogram.counts),
+        lambda: build_distribution_figure(histogram, player_bin),
+    )
+
+
+def prime_distribution_figures(metro_key: str, histogram: ScoreHistogram) -> list[go.Figure]:
+    """Build a histogram's chart for every player bin into the cache ahead of use."""
+    return [
+        HISTOGRAM_CACHE.get_or_build(
+            ('figure', metro_key, player_bin, histogram.counts),
+            lambda player_bin=player_bin: build_distribution_figure(histogram, player_bin),
+        )
+        for player_bin in range(len(SCORE_BINS))
+    ]
@@ -0,0 +1,203 @@
+"""Persistent store of finished games with per-metro, per-day score histograms.
+
+Finished games are queued by the app and written by one background thread
+into SQLite (WAL mode), so the rerun that ends a game never waits on disk.
+Each batch inserts the raw plays and, in the same transaction, bumps the
+``score_histogram`` rows for (metro, day, score); readers only ever touch
+those aggregate rows, never the raw plays.
+
+Inspect today's histograms with::
+
+    python score_store.py
+"""
+import argparse
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import perf
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_DB_PATH = BASE_DIR / "game_data" / "scores.sqlite3"
+MAX_BATCH = 500
+# A batch that fails this many times (locked database, full disk) is dropped
+WRITE_ATTEMPTS = 3
+RETRY_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    metro TEXT NOT NULL,
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_histogram (
+    metro TEXT NOT NULL,
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    plays INTEGER NOT NULL,
+    PRIMARY KEY (metro, day, score)
+) WITHOUT ROWID;
+"""
+
+UPSERT_HISTOGRAM = """
+INSERT INTO score_histogram (metro, day, score, plays) VALUES (?, ?, ?, ?)
+ON CONFLICT (metro, day, score) DO UPDATE SET plays = plays + excluded.plays
+"""
+
+
+def today() -> str:
+    """Return the current UTC day as YYYY-MM-DD (the histogram day key)."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class ScoreStore:
+    """SQLite-backed score store with a background writer thread."""
+
+    def __init__(self, path: Path | str = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        self.written = 0
+        self.dropped = 0
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+        self._writer = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ========== WRITES ==========
+    def record(self, metro_key: str, score: int, won: bool, guesses: int, day: str | None = None) -> None:
+        """Queue one finished game; returns immediately."""
+        self._queue.put((metro_key, day or today(), int(score), int(won), int(guesses), time.time()))
+
+    def flush(self) -> None:
+        """Block until every queued game has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write any queued games and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _run(self) -> None:
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows:
+                    self._write_batch(conn, rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                conn.close()
+                return
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        """Write a batch, retrying failures; drop and log it if they persist, so the writer never dies."""
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self._write(conn, rows)
+                return
+            except Exception:
+                perf.count('score_write_errors')
+                if attempt == WRITE_ATTEMPTS:
+                    self.dropped += len(rows)
+                    perf.count('score_plays_dropped', len(rows))
+                    logger.exception("Dropped %d finished games after %d failed writes", len(rows), attempt)
+                    return
+                logger.warning("Score write failed (attempt %d of %d); retrying", attempt, WRITE_ATTEMPTS,
+                               exc_info=True)
+                time.sleep(RETRY_SECONDS * attempt)
+
+    def _write(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        increments = Counter((metro, day, score) for metro, day, score, *_ in rows)
+        with conn:
+            conn.executemany(
+                "INSERT INTO plays (metro, day, score, won, guesses, finished_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(UPSERT_HISTOGRAM, [(*key, plays) for key, plays in increments.items()])
+        self.written += len(rows)
+
+    # ========== READS ==========
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def histogram(self, metro_key: str, day: str | None = None) -> dict[int, int]:
+        """Return {score: plays} for a metro on a day (today by default)."""
+        rows = self._reader().execute(
+            "SELECT score, plays FROM score_histogram WHERE metro = ? AND day = ?",
+            (metro_key, day or today()),
+        )
+        return dict(rows)
+
+    def days(self, metro_key: str) -> list[str]:
+        """Return the days with recorded plays for a metro, newest first."""
+        rows = self._reader().execute(
+            "SELECT DISTINCT day FROM score_histogram WHERE metro = ? ORDER BY day DESC",
+            (metro_key,),
+        )
+        return [day for day, in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ScoreStore:
+    """Return the process-wide store (path from GTM_SCORE_DB)."""
+    global _store
+    if _store is not None:
+        return _store
+    with _store_lock:
+        if _store is None:
+            _store = ScoreStore(os.environ.get("GTM_SCORE_DB") or DEFAULT_DB_PATH)
+            atexit.register(_store.close)
+    return _store
+
+
+if __name__ == "__main__":
+    from game_config import METROS
+
+    parser = argparse.ArgumentParser(description="Print per-metro score histograms for a day")
+    parser.add_argument("--day", default=None, help="YYYY-MM-DD (default: today, UTC)")
+    args = parser.parse_args()
+    store = get_store()
+    day = args.day or today()
+    print(f"Score histograms for {day} ({store.path})")
+    for metro_key in METROS:
+        counts = store.histogram(metro_key, day)
+        total = sum(counts.values())
+        cells = "  ".join(f"{score:>2}:{counts.get(score, 0):>6}" for score in range(0, 51, 10))
+        print(f"  {metro_key:<12} {total:>7} plays  {cells}")
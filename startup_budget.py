@@ -0,0 +1,117 @@
+"""Cold-start import-time budget for the app.
+
+Imports every module that ``app.py`` imports at the top level in a fresh
+interpreter and fails when that takes longer than the budget, or when a
+module that should only load on first use (``LAZY_MODULES``) is pulled in
+eagerly. Streamlit itself is imported first and not counted: it costs the
+same for any app. Each check takes the fastest of several cold starts, and
+lists the heaviest imports (``python -X importtime``) to show what to defer::
+
+    python startup_budget.py                  # exit 1 if over budget
+    python startup_budget.py --budget-ms 500 --top 15
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+APP_FILE = BASE_DIR / "app.py"
+BUDGET_ENV = "GTM_IMPORT_BUDGET_MS"
+DEFAULT_BUDGET_MS = 450
+RUNS = 5
+
+# Loaded on first use by the code paths that need them, never at startup
+LAZY_MODULES = (
+    "pandas",              # hints render from compact records; only percentile builds need it
+    "plotly.express",      # heavy import graph; the hints build with graph_objects
+    "score_distribution",  # result modal and daily bundles only
+)
+
+_PROBE = """
+import json, sys, time
+import streamlit
+print("--- app imports ---", file=sys.stderr, flush=True)
+preloaded = set(sys.modules)
+started = time.perf_counter()
+for name in sys.argv[2:]:
+    __import__(name)
+elapsed = time.perf_counter() - started
+eager = [name for name in json.loads(sys.argv[1]) if name in sys.modules and name not in preloaded]
+print(json.dumps({'seconds': elapsed, 'eager': eager}))
+"""
+
+
+def app_imports(path: Path = APP_FILE) -> list[str]:
+    """Return the modules an app script imports at module level, in order."""
+    modules = []
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return [name for name in dict.fromkeys(modules) if name.split(".")[0] != "streamlit"]
+
+
+def cold_start(modules: list[str]) -> dict:
+    """Import modules in a fresh interpreter after streamlit.
+
+    Returns the seconds taken, the ``LAZY_MODULES`` they pulled in and the
+    ``-X importtime`` rows as (module, self us, cumulative us).
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, json.dumps(LAZY_MODULES), *modules],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    rows = []
+    app_lines = completed.stderr.split("--- app imports ---", 1)[-1]
+    for line in app_lines.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        rows.append((name, int(self_us), int(cumulative_us)))
+    result['imports'] = rows
+    return result
+
+
+def format_report(runs: list[dict], budget_ms: float, top: int) -> str:
+    times = [run['seconds'] * 1000 for run in runs]
+    lines = [f"app imports: {min(times):.0f} ms fastest, {statistics.median(times):.0f} ms median "
+             f"of {len(times)} cold starts (budget {budget_ms:.0f} ms)"]
+    fastest = min(runs, key=lambda run: run['seconds'])
+    heaviest = sorted(fastest['imports'], key=lambda row: row[2], reverse=True)[:top]
+    lines.append(f"{'module':<44}{'self ms':>9}{'cumulative ms':>15}")
+    for name, self_us, cumulative_us in heaviest:
+        lines.append(f"{name[:43]:<44}{self_us / 1000:>9.1f}{cumulative_us / 1000:>15.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the app's cold-start import time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    args = parser.parse_args(argv)
+
+    modules = app_imports()
+    runs = [cold_start(modules) for _ in range(args.runs)]
+    print(format_report(runs, args.budget_ms, args.top))
+
+    failures = []
+    fastest_ms = min(run['seconds'] for run in runs) * 1000
+    if fastest_ms > args.budget_ms:
+        failures.append(f"app imports took {fastest_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for name in sorted({name for run in runs for name in run['eager']}):
+        failures.append(f"{name} is imported at startup; it should load on first use")
+    for message in failures:
+        print(f"OVER BUDGET {message}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,859 @@
+"""Offline build of content-hashed static files served from ``static/``.
+
+Usage::
+
+    python static_assets.py            # (re)build static/ and its manifest
+    python static_assets.py --check    # exit 1 if static/ is out of date
+
+The app stylesheet, header logo and win-celebration page are written to
+``static/`` under names containing a hash of their content, and served by
+Streamlit's static file serving (``.streamlit/config.toml``). Pages reference
+them by URL instead of re-sending them on every rerun, and since a changed
+file gets a new name, browsers and proxies can cache each URL indefinitely.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from game_config import REVELIO_PALETTE, UI_SCALE
+
+BASE_DIR = Path(__file__).resolve().parent
+STATIC_DIR = BASE_DIR / "static"
+STATIC_URL = "app/static"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+LOGO_PATH = BASE_DIR / "city-data-chart.png"
+
+
+# ========== SOURCES ==========
+def build_css() -> str:
+    """Return the app stylesheet with utility classes and existing styles"""
+    return f"""\
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+
+    :root {{
+        font-size: {UI_SCALE * 100:.0f}%;
+    }}
+
+    html, body {{
+        background-color: {REVELIO_PALETTE["subtle_bg"]};
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif !important;
+    }}
+
+    section.main > div:first-child {{
+        padding-top: 3rem;
+    }}
+
+    .block-container {{
+        padding: 0.7rem 0.85rem 0.6rem;
+        max-width: 960px;
+    }}
+
+    .maxw,
+    .maxw-tight {{
+        max-width: 880px;
+        margin-left: auto;
+        margin-right: auto;
+    }}
+
+    h1 {{
+        color: {REVELIO_PALETTE["text"]};
+        font-weight: 700;
+        font-size: 1.35rem;
+        letter-spacing: -0.02em;
+        margin: 0 0 0.3rem;
+    }}
+
+    h2,
+    h3,
+    h4 {{
+        color: {REVELIO_PALETTE["text"]};
+        font-weight: 600;
+        margin: 0.2rem 0;
+    }}
+
+    h2 {{ font-size: 0.95rem; }}
+    h3 {{ font-size: 0.9rem; }}
+    h4 {{ font-size: 0.88rem; }}
+
+    p {{
+        margin: 0.08rem 0;
+        line-height: 1.35;
+        font-size: 0.9rem;
+    }}
+
+    .stCaption {{
+        color: {REVELIO_PALETTE["light_gray"]} !important;
+        font-size: 0.78rem !important;
+        margin-top: 0.05rem !important;
+    }}
+
+    .card {{
+        background: white;
+        padding: 0.55rem 0.75rem;
+        border-radius: 12px;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        box-shadow: 0 8px 20px rgba(15, 23, 42, 0.04);
+    }}
+
+    .card.control-card {{
+        padding: 0.7rem 0.85rem;
+        display: flex;
+        flex-direction: column;
+        gap: 0.45rem;
+    }}
+
+    .card.control-card [data-testid="column"] {{
+        padding: 0 !important;
+    }}
+
+    .card.control-card div[data-testid="stHorizontalBlock"] {{
+        gap: 0.48rem;
+    }}
+
+    .card.control-card [data-testid="stTextInput"] label {{
+        display: none;
+    }}
+
+    .card.control-card [data-testid="column"] + [data-testid="column"] {{
+        margin-left: 0.45rem;
+    }}
+
+    .card.control-card [data-testid="stTextInput"] > div:first-child {{
+        margin-bottom: 0;
+    }}
+
+    .card.control-card .stTextInput div[data-baseweb="input"] {{
+        border-radius: 999px;
+    }}
+
+    .card.control-card .stButton {{
+        margin-top: 0 !important;
+    }}
+
+    .card.control-card .stButton button {{
+        width: 100%;
+    }}
+
+    .page-header {{
+        margin: 0 auto 0.5rem;
+        display: flex;
+        flex-direction: row;
+        align-items: center;
+        gap: 0.6rem;
+    }}
+
+    .page-header__logo {{
+        width: 52px;
+        height: auto;
+    }}
+
+    .stack-tight {{
+        display: flex;
+        flex-direction: column;
+        gap: 0.55rem;
+    }}
+
+    .layout-split {{
+        display: flex;
+        gap: 0.8rem;
+        align-items: flex-start;
+    }}
+
+    .hud {{
+        display: grid;
+        grid-template-columns: minmax(0, 1.2fr) minmax(0, 0.6fr);
+        gap: 12px;
+        align-items: center;
+        width: 100%;
+        padding: 10px 14px;
+        background: white;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        border-radius: 14px;
+        box-shadow: 0 10px 24px rgba(15, 23, 42, 0.05);
+        margin: 0 auto 0.5rem;
+    }}
+
+    .hud-block {{
+        display: flex;
+        flex-direction: column;
+        gap: 0.22rem;
+    }}
+
+    .hud-label {{
+        font-size: 11px;
+        font-weight: 600;
+        color: {REVELIO_PALETTE["gray"]};
+        text-transform: uppercase;
+        letter-spacing: 0.08em;
+        margin: 0;
+    }}
+
+    .badge {{
+        border: 1px solid {REVELIO_PALETTE["primary"]};
+        padding: 0.45rem 1.1rem;
+        border-radius: 999px;
+        background: {REVELIO_PALETTE["primary"]};
+        font-weight: 600;
+        font-size: 0.9rem;
+        color: white;
+        display: inline-flex;
+        align-items: center;
+        justify-content: center;
+        gap: 0.35rem;
+        box-shadow: 0 8px 20px rgba(0, 102, 255, 0.22);
+    }}
+
+    .guess-slot-list {{
+        display: flex;
+        flex-direction: column;
+        gap: 0.45rem;
+        margin-bottom: 0.65rem;
+    }}
+
+    .guess-slot {{
+        padding: 0.55rem 0.75rem;
+        border-radius: 10px;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        background: white;
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+        min-height: 44px;
+        gap: 0.75rem;
+    }}
+
+    .guess-slot-filled {{
+        color: {REVELIO_PALETTE["text"]};
+        font-weight: 600;
+    }}
+
+    .guess-slot-empty {{
+        border-style: dashed;
+        background: rgba(226, 232, 240, 0.4);
+        color: {REVELIO_PALETTE["light_gray"]};
+        font-weight: 500;
+    }}
+
+    .guess-slot-wrong {{
+        border-color: {REVELIO_PALETTE["accent"]};
+        background: rgba(255, 107, 107, 0.12);
+        color: {REVELIO_PALETTE["accent"]};
+    }}
+
+    @keyframes guessShake {{
+        0%, 100% {{
+            transform: translateX(0);
+        }}
+        20%, 60% {{
+            transform: translateX(-6px);
+        }}
+        40%, 80% {{
+            transform: translateX(6px);
+        }}
+    }}
+
+    .guess-slot-shake {{
+        animation: guessShake 0.45s ease;
+    }}
+
+    .guess-slot-correct {{
+        border-color: {REVELIO_PALETTE["secondary"]};
+        background: rgba(0, 204, 136, 0.14);
+        color: {REVELIO_PALETTE["secondary"]};
+    }}
+
+    .guess-slot-index {{
+        font-size: 0.78rem;
+        font-weight: 600;
+        color: {REVELIO_PALETTE["gray"]};
+        letter-spacing: 0.05em;
+    }}
+
+    .guess-slot-value {{
+        font-size: 0.92rem;
+        font-weight: 600;
+    }}
+
+    .loss-banner,
+    .win-banner {{
+        display: none;
+    }}
+
+    .loss-subtext {{
+        font-size: 0.95rem;
+        color: {REVELIO_PALETTE["gray"]};
+        margin-top: 0.6rem;
+        text-align: center;
+    }}
+
+    .result-card {{
+        text-align: center;
+        background: white;
+        border-radius: 16px;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        box-shadow: 0 16px 38px rgba(15, 23, 42, 0.12);
+        padding: 1.4rem 1.8rem 1.5rem;
+    }}
+
+    .result-card h3 {{
+        margin: 0;
+        font-size: 1.6rem;
+        font-weight: 700;
+        color: {REVELIO_PALETTE["text"]};
+    }}
+
+    .result-card p {{
+        margin: 0.6rem 0 0.8rem;
+        font-size: 1.03rem;
+        line-height: 1.5;
+    }}
+
+    .result-card ul {{
+        margin: 0.4rem auto 0;
+        padding-left: 1.2rem;
+        max-width: 520px;
+        text-align: left;
+    }}
+
+    .result-card li {{
+        margin-bottom: 0.35rem;
+        font-size: 0.98rem;
+    }}
+
+    [data-testid="stHorizontalBlock"] {{
+        gap: 0.6rem;
+    }}
+
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 3px;
+        background: white;
+        padding: 3px;
+        border-radius: 10px;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        box-shadow: 0 10px 24px rgba(15, 23, 42, 0.05);
+        margin: 0;
+    }}
+
+    .stTabs [data-baseweb="tab"] {{
+        padding: 10px 12px;
+        font-size: 1rem;
+        font-weight: 600;
+        border-radius: 8px;
+    }}
+
+    .stTabs [data-baseweb="tab"][aria-selected="true"] {{
+        font-weight: 700;
+    }}
+
+    .stTabs {{
+        margin: 0 !important;
+        padding: 0 !important;
+    }}
+
+    [data-testid="stPlotlyChart"] {{
+        background: transparent;
+        padding: 0;
+        margin: 0;
+        max-width: 920px;
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        overflow: visible !important;
+    }}
+
+    [data-testid="stPlotlyChart"] > div {{
+        width: 100% !important;
+        margin: 0 auto;
+        overflow: visible !important;
+    }}
+
+    .stButton button {{
+        border-radius: 999px;
+        font-weight: 500;
+        padding: 0.48rem 1rem;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        transition: all 0.18s ease;
+    }}
+
+    .stButton button:hover {{
+        transform: translateY(-1px);
+        box-shadow: 0 8px 18px rgba(15, 23, 42, 0.1);
+    }}
+
+    .stButton button:focus {{
+        outline: 2px solid {REVELIO_PALETTE["primary"]};
+        outline-offset: 2px;
+    }}
+
+    .stButton button[kind="primary"] {{
+        background-color: {REVELIO_PALETTE["primary"]};
+        color: white;
+        border-color: {REVELIO_PALETTE["primary"]};
+    }}
+
+    .stButton button[kind="secondary"] {{
+        background-color: transparent;
+        color: {REVELIO_PALETTE["gray"]};
+        border-color: {REVELIO_PALETTE["grid"]};
+    }}
+
+    .guess-history {{
+        background: white;
+        padding: 0.75rem 0.95rem;
+        border-radius: 10px;
+        border: 1px solid {REVELIO_PALETTE["grid"]};
+        margin: 0.7rem 0;
+        box-shadow: 0 12px 26px rgba(15, 23, 42, 0.05);
+    }}
+
+    .guess-item,
+    .guess-remaining {{
+        display: inline-flex;
+        padding: 6px 14px;
+        border-radius: 999px;
+        font-weight: 500;
+        font-size: 0.8rem;
+        margin: 4px 8px 4px 0;
+    }}
+
+    .guess-item {{
+        background: {REVELIO_PALETTE["accent"]};
+        color: white;
+    }}
+
+    .guess-remaining {{
+        background: {REVELIO_PALETTE["grid"]};
+        color: {REVELIO_PALETTE["light_gray"]};
+    }}
+
+    .stAlert {{
+        padding: 0.7rem 0.9rem;
+        font-size: 0.93rem;
+        border-radius: 9px;
+        margin: 0.45rem 0;
+    }}
+
+    hr {{
+        margin: 0.18rem 0 0.4rem;
+        border: none;
+        border-top: 1px solid {REVELIO_PALETTE["grid"]};
+    }}
+
+    .stTextInput {{
+        margin-bottom: 0;
+    }}
+
+    [class*="st-key-metro_choice_"] [role="radiogroup"] {{
+        gap: 0.15rem;
+    }}
+
+    .anim-x {{
+        position: fixed;
+        top: 14%;
+        left: 50%;
+        transform: translate(-50%, 0);
+        font-size: 4.4rem;
+        color: {REVELIO_PALETTE["accent"]};
+        font-weight: 700;
+        text-shadow: 0 12px 28px rgba(255, 107, 107, 0.45);
+        z-index: 9999;
+        animation: rise-x 1.05s ease-out forwards;
+        pointer-events: none;
+    }}
+
+    @keyframes rise-x {{
+        0% {{ opacity: 0; transform: translate(-50%, 18px) scale(0.92); }}
+        35% {{ opacity: 1; transform: translate(-50%, -6px) scale(1.03); }}
+        100% {{ opacity: 0; transform: translate(-50%, -44px) scale(0.96); }}
+    }}
+
+    .guess-toast {{
+        position: fixed;
+        top: 50%;
+        left: 50%;
+        transform: translate(-50%, -50%) scale(0.92);
+        background: rgba(255, 255, 255, 0.98);
+        color: {REVELIO_PALETTE["accent"]};
+        padding: 1.2rem 2rem;
+        border-radius: 18px;
+        border: 2px solid rgba(255, 107, 107, 0.35);
+        box-shadow: 0 32px 60px rgba(15, 23, 42, 0.25);
+        font-weight: 700;
+        font-size: 1.35rem;
+        text-align: center;
+        z-index: 9998;
+        min-width: min(90vw, 420px);
+        animation: toastFade 3.2s ease forwards;
+    }}
+
+    .guess-toast span {{
+        display: block;
+        margin-top: 0.4rem;
+        font-size: 1rem;
+        font-weight: 500;
+        color: {REVELIO_PALETTE["gray"]};
+    }}
+
+    @keyframes toastFade {{
+        0% {{ opacity: 0; transform: translate(-50%, -40%) scale(0.88); }}
+        18% {{ opacity: 1; transform: translate(-50%, -50%) scale(1.0); }}
+        82% {{ opacity: 1; transform: translate(-50%, -52%) scale(1.0); }}
+        100% {{ opacity: 0; transform: translate(-50%, -64%) scale(0.96); }}
+    }}
+
+    /* Hint revealed by a wrong guess: fade in after the shake/❌ plays */
+    .st-key-latest_hint_reveal {{
+        animation: hintReveal 0.5s ease-out 0.45s both;
+    }}
+
+    @keyframes hintReveal {{
+        0% {{ opacity: 0; transform: translateY(10px); }}
+        100% {{ opacity: 1; transform: translateY(0); }}
+    }}
+
+    *:focus-visible {{
+        outline: 2px solid {REVELIO_PALETTE["primary"]};
+        outline-offset: 2px;
+    }}
+
+    [data-testid="stDialog"] {{
+        background: rgba(15, 23, 42, 0.35);
+    }}
+
+    [data-testid="stDialog"] > div {{
+        background: white;
+        border-radius: 16px;
+        padding: 0;
+        max-width: 820px;
+        width: min(88vw, 820px);
+        box-shadow: 0 22px 48px rgba(15, 23, 42, 0.14);
+    }}
+
+    .intro-modal {{
+        padding: 1.8rem 2.2rem 1.6rem;
+        background: white;
+        border-radius: 16px;
+        text-align: center;
+    }}
+
+    .intro-modal h3 {{
+        font-size: 1.8rem;
+        margin-bottom: 1rem;
+        color: {REVELIO_PALETTE["text"]};
+    }}
+
+    .intro-modal p {{
+        font-size: 1.05rem;
+        line-height: 1.55;
+        margin-bottom: 0.65rem;
+    }}
+
+    .intro-modal ul {{
+        margin: 0.4rem auto 0.6rem;
+        padding: 0;
+        max-width: 520px;
+        text-align: left;
+    }}
+
+    .intro-modal li {{
+        font-size: 1.02rem;
+        margin-bottom: 0.35rem;
+    }}
+
+    .city-modal {{
+        padding: 1.6rem 2rem 1.4rem;
+        background: white;
+        border-radius: 16px;
+        text-align: center;
+    }}
+
+    .city-modal h3 {{
+        font-size: 1.6rem;
+        margin-bottom: 0.75rem;
+        color: {REVELIO_PALETTE["text"]};
+    }}
+
+    .city-modal p {{
+        margin-bottom: 0.6rem;
+        font-size: 1.05rem;
+        line-height: 1.58;
+    }}
+
+    .city-modal ul {{
+        margin: 0.4rem auto 0.4rem;
+        padding: 0;
+        max-width: 520px;
+        text-align: left;
+    }}
+
+    .city-modal li {{
+        font-size: 1rem;
+        margin-bottom: 0.35rem;
+    }}
+
+    @media (max-width: 900px) {{
+        .hud {{
+            grid-template-columns: 1fr;
+            gap: 10px;
+        }}
+        .layout-split {{
+            flex-direction: column;
+        }}
+    }}
+"""
+
+
+CELEBRATION_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8" />
+    <style>
+        :root {
+            color-scheme: light;
+        }
+        body {
+            margin: 0;
+            font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: transparent;
+        }
+        .stage {
+            position: relative;
+            width: 100%;
+            height: 100%;
+            border-radius: 18px;
+            overflow: hidden;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            flex-direction: column;
+            gap: 14px;
+            background: radial-gradient(circle at center, rgba(0, 204, 136, 0.18), rgba(0, 102, 255, 0.08));
+            box-shadow: 0 18px 44px rgba(15, 23, 42, 0.18);
+        }
+        .stage::after {
+            content: '';
+            position: absolute;
+            inset: -45%;
+            background: conic-gradient(from 0deg, rgba(0, 102, 255, 0.35), rgba(139, 92, 246, 0.22), rgba(255, 107, 107, 0.35), rgba(0, 204, 136, 0.35), rgba(0, 102, 255, 0.35));
+            animation: swirl 9s linear infinite;
+            opacity: 0.35;
+            z-index: 0;
+        }
+        .title {
+            font-size: 2rem;
+            font-weight: 800;
+            color: #0F172A;
+            text-transform: uppercase;
+            letter-spacing: 0.08em;
+            text-align: center;
+            z-index: 1;
+        }
+        .subtitle {
+            font-size: 1.05rem;
+            font-weight: 600;
+            color: #1E293B;
+            text-align: center;
+            z-index: 1;
+        }
+        .burst {
+            position: absolute;
+            width: 140px;
+            height: 140px;
+            border-radius: 50%;
+            border: 4px solid rgba(255, 255, 255, 0.9);
+            z-index: 0;
+            animation: ping 1.8s ease-out infinite;
+        }
+        .burst.delay {
+            animation-delay: 0.6s;
+        }
+        .confetti {
+            position: absolute;
+            top: -12%;
+            width: 12px;
+            height: 18px;
+            border-radius: 4px;
+            opacity: 0;
+            animation: fall 2.8s linear infinite;
+        }
+        @keyframes fall {
+            0% {
+                transform: translate3d(0, -160px, 0) scale(var(--scale, 1)) rotate(0deg);
+                opacity: 0;
+            }
+            10% {
+                opacity: 1;
+            }
+            60% {
+                opacity: 1;
+            }
+            100% {
+                transform: translate3d(0, 360px, 0) scale(var(--scale, 1)) rotate(var(--rotation, 720deg));
+                opacity: 0;
+            }
+        }
+        @keyframes ping {
+            0% {
+                transform: scale(0.5);
+                opacity: 0.8;
+            }
+            60% {
+                transform: scale(1.4);
+                opacity: 0.1;
+            }
+            100% {
+                transform: scale(1.6);
+                opacity: 0;
+            }
+        }
+        @keyframes swirl {
+            to {
+                transform: rotate(360deg);
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="stage">
+        <div class="burst"></div>
+        <div class="burst delay"></div>
+        <div class="title">Metro Master!</div>
+        <div class="subtitle">You nailed today's mystery city.</div>
+    </div>
+    <script>
+        const stage = document.querySelector('.stage');
+        const colors = ['#FF6B6B', '#FAD232', '#00CC88', '#8B5CF6', '#60A5FA', '#FF9F6B'];
+        for (let i = 0; i < 180; i++) {
+            const piece = document.createElement('span');
+            piece.className = 'confetti';
+            piece.style.setProperty('--scale', (0.7 + Math.random() * 0.9).toFixed(2));
+            piece.style.setProperty('--rotation', (360 + Math.random() * 720).toFixed(2) + 'deg');
+            piece.style.left = (Math.random() * 100).toFixed(2) + '%';
+            piece.style.animationDelay = (Math.random() * 1.2).toFixed(2) + 's';
+            piece.style.background = colors[i % colors.length];
+            stage.appendChild(piece);
+        }
+        setTimeout(() => {
+            document.body.style.transition = 'opacity 0.7s ease';
+            document.body.style.opacity = '0';
+        }, 3200);
+    </script>
+</body>
+</html>
+"""
+
+
+def static_sources() -> dict[str, bytes]:
+    """Return the content of every static file keyed by its logical name"""
+    sources = {
+        'app.css': build_css().encode("utf-8"),
+        'celebration.html': CELEBRATION_HTML.encode("utf-8"),
+    }
+    if LOGO_PATH.exists():
+        sources[LOGO_PATH.name] = LOGO_PATH.read_bytes()
+    return sources
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """Return the file name with a content hash before its extension"""
+    path = Path(name)
+    return f"{path.stem}.{hashlib.sha256(content).hexdigest()[:12]}{path.suffix}"
+
+
+# ========== BUILD ==========
+def read_manifest(static_dir: Path = STATIC_DIR) -> dict:
+    """Return the manifest, or an empty one if it is missing or unreadable"""
+    try:
+        manifest = json.loads((static_dir / MANIFEST_FILE).read_text())
+    except (FileNotFoundError, ValueError):
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'files': {}}
+    return manifest
+
+
+def expected_files() -> dict[str, dict]:
+    """Return the manifest entries the current sources should produce"""
+    return {
+        name: {'file': hashed_name(name, content), 'bytes': len(content)}
+        for name, content in static_sources().items()
+    }
+
+
+def build_static(static_dir: Path = STATIC_DIR) -> tuple[dict, list[str]]:
+    """Write every missing static file and return (manifest, written names)"""
+    static_dir.mkdir(parents=True, exist_ok=True)
+    files = {}
+    written = []
+    for name, content in static_sources().items():
+        filename = hashed_name(name, content)
+        files[name] = {'file': filename, 'bytes': len(content)}
+        target = static_dir / filename
+        if not target.exists():
+            tmp_target = target.with_name(f".{filename}.{os.getpid()}.tmp")
+            tmp_target.write_bytes(content)
+            os.replace(tmp_target, target)
+            written.append(name)
+
+    # Remove files no longer referenced by the manifest
+    referenced = {entry['file'] for entry in files.values()} | {MANIFEST_FILE}
+    for path in static_dir.iterdir():
+        if path.is_file() and not path.name.startswith(".") and path.name not in referenced:
+            path.unlink()
+
+    manifest = {'version': MANIFEST_VERSION, 'files': dict(sorted(files.items()))}
+    (static_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest, written
+
+
+def stale_static(static_dir: Path = STATIC_DIR) -> list[str]:
+    """Return the logical names whose hashed file is missing or out of date"""
+    manifest = read_manifest(static_dir)
+    return [
+        name for name, entry in expected_files().items()
+        if manifest['files'].get(name, {}).get('file') != entry['file']
+        or not (static_dir / entry['file']).exists()
+    ]
+
+
+# ========== RUNTIME ==========
+@lru_cache(maxsize=1)
+def ensure_built() -> dict:
+    """Build static/ if it is out of date and return its manifest (once per process)"""
+    if stale_static():
+        return build_static()[0]
+    return read_manifest()
+
+
+def asset_url(name: str) -> str:
+    """Return the served URL of a static file by its logical name"""
+    return f"{STATIC_URL}/{ensure_built()['files'][name]['file']}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build content-hashed static files into static/")
+    parser.add_argument("--check", action="store_true", help="exit 1 if static/ is out of date")
+    parser.add_argument("--output", type=Path, default=STATIC_DIR, help="static directory")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = stale_static(args.output)
+        for name in stale:
+            print(f"stale: {name}")
+        return 1 if stale else 0
+
+    manifest, written = build_static(args.output)
+    for name, entry in manifest['files'].items():
+        marker = "*" if name in written else " "
+        print(f"{marker} {name:<20} {entry['file']:<36} {entry['bytes']:>9,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Process-wide warm-up of every playable metro at server start.
+
+Hint figures are read from the pre-rendered ``hint_assets/`` when current;
+anything missing is built in parallel worker processes and handed back as
+Plotly JSON. Either way the JSON is rehydrated once into the shared figure
+cache, so no player pays figure construction on their first rerun. A
+readiness file (``GTM_READY_FILE``) is written only once every metro is
+hot, for use as a container readiness probe; a failed warm-up is logged and
+leaves it absent.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import plotly.io as pio
+
+import hint_assets
+import hint_figures
+import metro_store
+
+READY_FILE_ENV = "GTM_READY_FILE"
+WORKERS_ENV = "GTM_WARMUP_WORKERS"
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_metro(metro_key: str) -> tuple[str, dict[str, list[str]]]:
+    """Build every hint figure for a metro as JSON (runs in a worker process)."""
+    hint_figures.register_plotly_template()
+    figures = hint_figures.build_hint_figures(metro_key)
+    return metro_key, {
+        hint_key: [fig.to_json() for fig in hint_list]
+        for hint_key, hint_list in figures.items()
+    }
+
+
+def load_prebuilt_metro(metro_key: str) -> dict[str, list[str]] | None:
+    """Return a metro's hint JSON from hint_assets/ if every asset is current."""
+    payload = {}
+    for hint_key in hint_figures.HINT_FIGURE_BUILDERS:
+        figure_json = hint_assets.load_hint_json(metro_key, hint_key)
+        if figure_json is None:
+            return None
+        payload[hint_key] = figure_json
+    return payload
+
+
+class Warmup:
+    """Background warm-up of hint figures with a readiness signal."""
+
+    def __init__(self, metros, max_workers: int | None = None, ready_file: str | None = None):
+        self.metros = list(metros)
+        env_workers = os.environ.get(WORKERS_ENV)
+        self.max_workers = max_workers or (int(env_workers) if env_workers else None)
+        self.ready_file = ready_file or os.environ.get(READY_FILE_ENV)
+        self.finished = threading.Event()  # set when warm-up ends, hot or not
+        self.ready = threading.Event()     # set only when every metro is hot
+        self.warm_metros = set()
+        self.errors = {}
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    @property
+    def duration(self) -> float | None:
+        """Seconds the warm-up took, once finished."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def start(self) -> "Warmup":
+        """Start warming up in a daemon thread and return immediately."""
+        if self._thread is None:
+            if self.ready_file:
+                Path(self.ready_file).unlink(missing_ok=True)
+            self._thread = threading.Thread(target=self.run, name="metro-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def hot_metros(self) -> set[str]:
+        """Warmed metros whose figures are all still in the shared figure cache."""
+        return {
+            metro_key for metro_key in self.warm_metros
+            if all(hint_figures.figure_cache_key(metro_key, hint_key) in hint_figures.FIGURE_CACHE
+                   for hint_key in hint_figures.HINT_FIGURE_BUILDERS)
+        }
+
+    def run(self) -> None:
+        """Build every metro's figures, then mark the process ready if all of them are hot."""
+        self.started_at = time.perf_counter()
+        needed = len(self.metros) * len(hint_figures.HINT_FIGURE_BUILDERS)
+        capacity = hint_figures.FIGURE_CACHE.max_entries
+        if capacity is not None and capacity < needed:
+            logger.warning("%s=%d holds fewer than the %d hint figures of %d metros; warm-up will evict "
+                           "its own figures and the process will not be marked ready",
+                           hint_figures.FIGURE_CACHE_ENTRIES_ENV, capacity, needed, len(self.metros))
+        try:
+            # Compile the data store once here so workers never race to rebuild it
+            metro_store.open_store()
+            for metro_key, payload in self._prepare_all():
+                self._store(metro_key, payload)
+        except Exception as exc:
+            # Store or pool failure: every metro not yet warm stays cold
+            for metro_key in self.metros:
+                if metro_key not in self.warm_metros:
+                    self.errors.setdefault(metro_key, exc)
+            logger.exception("Warm-up failed")
+        finally:
+            self.finished_at = time.perf_counter()
+            hot = self.hot_metros()
+            if hot.issuperset(self.metros):
+                self.ready.set()
+                if self.ready_file:
+                    Path(self.ready_file).write_text(f"{len(self.metros)}/{len(self.metros)}\n")
+                logger.info("Warm-up finished for %d metros in %.2fs", len(self.metros), self.duration)
+            else:
+                logger.error("Warm-up left %d of %d metros cold after %.2fs; not marking the process ready",
+                             len(self.metros) - len(hot), len(self.metros), self.duration)
+            self.finished.set()
+
+    def _prepare_all(self):
+        # Metros with current pre-rendered assets are read from disk; the rest are built
+        pending = []
+        for metro_key in self.metros:
+            payload = load_prebuilt_metro(metro_key)
+            if payload is None:
+                pending.append(metro_key)
+            else:
+                yield metro_key, payload
+        if not pending:
+            return
+
+        workers = min(self.max_workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            try:
+                # spawn keeps workers from inheriting the server's threads and sockets
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    yield from pool.map(prepare_metro, pending)
+                return
+            except Exception:
+                logger.exception("Parallel warm-up failed; falling back to in-process build")
+        for metro_key in pending:
+            if metro_key in self.warm_metros:
+                continue
+            try:
+                yield prepare_metro(metro_key)
+            except Exception as exc:
+                self.errors[metro_key] = exc
+                logger.exception("Warm-up failed for %s", metro_key)
+
+    def _store(self, metro_key: str, payload: dict[str, list[str]]) -> None:
+        for hint_key, figure_json in payload.items():
+            hint_figures.FIGURE_CACHE.put(
+                hint_figures.figure_cache_key(metro_key, hint_key),
+                [pio.from_json(item) for item in figure_json],
+            )
+        hint_figures.get_sector_legend_html(metro_key)
+        self.warm_metros.add(metro_key)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until warm-up finishes; return whether the process is ready."""
+        self.finished.wait(timeout)
+        return self.ready.is_set()